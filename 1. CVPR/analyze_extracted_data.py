@@ -2,67 +2,148 @@
 
 import json
 import argparse
-from collections import Counter
+import heapq
+import math
+import sys
+from operator import itemgetter
 
-def analyze_extracted_data(json_file: str) -> None:
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from bounter import bounter
+except ImportError:
+    bounter = None
+
+
+def iter_papers(json_file: str):
+    """
+    Yield papers one at a time from the extracted JSON file.
+    
+    JSON Lines files (.jsonl) are read one line at a time. For a JSON array,
+    ijson streams the top-level array when available so the whole file is
+    never materialized; otherwise falls back to a full parse with orjson,
+    or stdlib json if orjson is not installed either.
+    
+    Args:
+        json_file (str): Path to the JSON or JSON Lines file
+    """
+    with open(json_file, 'rb') as f:
+        if json_file.endswith('.jsonl'):
+            loads = orjson.loads if orjson is not None else json.loads
+            for line in f:
+                if line.strip():
+                    yield loads(line)
+        elif ijson is not None:
+            yield from ijson.items(f, 'item')
+        elif orjson is not None:
+            yield from orjson.loads(f.read())
+        else:
+            yield from json.load(f)
+
+def analyze_extracted_data(json_file: str, approximate_authors: bool = False,
+                           counter_size_mb: int = 64) -> None:
     """
     Analyze the extracted CVPR paper data and provide statistics.
     
     Args:
         json_file (str): Path to the JSON file
+        approximate_authors (bool, optional): Count authors with a fixed-memory
+            bounter counter instead of an exact dict (for very large corpora)
+        counter_size_mb (int, optional): Memory budget for the bounter counter
     """
     try:
-        with open(json_file, 'r', encoding='utf-8') as f:
-            papers = json.load(f)
+        use_bounter = approximate_authors and bounter is not None
+        if approximate_authors and not use_bounter:
+            print("bounter is not installed, falling back to exact author counts")
+        
+        n_papers = 0
+        pdf_count = supp_count = arxiv_count = bibtex_count = 0
+        author_counts = bounter(size_mb=counter_size_mb) if use_bounter else {}
+        total_author_refs = 0
+        sum_title_len = 0
+        min_title_len = math.inf
+        max_title_len = 0
+        sample = []
+        
+        # Fold every statistic in one streaming pass over the papers
+        for paper in iter_papers(json_file):
+            n_papers += 1
+            
+            doc_list = paper['doc_list']
+            pdf_count += bool(doc_list['pdf'])
+            supp_count += bool(doc_list['supp'])
+            arxiv_count += bool(doc_list['arxiv'])
+            bibtex_count += bool(doc_list['bibtex'])
+            
+            author_list = paper['author_list']
+            if use_bounter:
+                author_counts.update(author_list)
+            else:
+                for author in author_list:
+                    # Interning collapses repeated names to one string object
+                    author = sys.intern(author)
+                    author_counts[author] = author_counts.get(author, 0) + 1
+            total_author_refs += len(author_list)
+            
+            title_len = len(paper['title'])
+            sum_title_len += title_len
+            if title_len < min_title_len:
+                min_title_len = title_len
+            if title_len > max_title_len:
+                max_title_len = title_len
+            
+            if len(sample) < 3:
+                sample.append(paper)
         
         print(f"📊 CVPR 2024 Papers Analysis")
         print(f"=" * 50)
-        print(f"Total papers extracted: {len(papers)}")
+        print(f"Total papers extracted: {n_papers}")
         print()
         
         # Analyze document availability
-        pdf_count = sum(1 for paper in papers if paper['doc_list']['pdf'])
-        supp_count = sum(1 for paper in papers if paper['doc_list']['supp'])
-        arxiv_count = sum(1 for paper in papers if paper['doc_list']['arxiv'])
-        bibtex_count = sum(1 for paper in papers if paper['doc_list']['bibtex'])
-        
         print(f"📄 Document Availability:")
-        print(f"  PDF links: {pdf_count} ({pdf_count/len(papers)*100:.1f}%)")
-        print(f"  Supplemental: {supp_count} ({supp_count/len(papers)*100:.1f}%)")
-        print(f"  ArXiv links: {arxiv_count} ({arxiv_count/len(papers)*100:.1f}%)")
-        print(f"  BibTeX entries: {bibtex_count} ({bibtex_count/len(papers)*100:.1f}%)")
+        print(f"  PDF links: {pdf_count} ({pdf_count/n_papers*100:.1f}%)")
+        print(f"  Supplemental: {supp_count} ({supp_count/n_papers*100:.1f}%)")
+        print(f"  ArXiv links: {arxiv_count} ({arxiv_count/n_papers*100:.1f}%)")
+        print(f"  BibTeX entries: {bibtex_count} ({bibtex_count/n_papers*100:.1f}%)")
         print()
         
         # Author statistics
-        all_authors = []
-        for paper in papers:
-            all_authors.extend(paper['author_list'])
-        
-        unique_authors = set(all_authors)
-        author_counts = Counter(all_authors)
-        top_authors = author_counts.most_common(10)
+        if use_bounter:
+            unique_authors = author_counts.cardinality()
+            top_authors = heapq.nlargest(10, author_counts.iteritems(), key=itemgetter(1))
+        else:
+            unique_authors = len(author_counts)
+            top_authors = heapq.nlargest(10, author_counts.items(), key=itemgetter(1))
         
-        print(f"👥 Author Statistics:")
-        print(f"  Total unique authors: {len(unique_authors)}")
-        print(f"  Average authors per paper: {len(all_authors)/len(papers):.1f}")
+        print(f"👥 Author Statistics{' (approximate)' if use_bounter else ''}:")
+        print(f"  Total unique authors: {unique_authors}")
+        print(f"  Average authors per paper: {total_author_refs/n_papers:.1f}")
         print(f"  Top 10 most prolific authors:")
         for i, (author, count) in enumerate(top_authors, 1):
             print(f"    {i:2d}. {author} ({count} papers)")
         print()
         
         # Title length statistics
-        title_lengths = [len(paper['title']) for paper in papers]
-        avg_title_length = sum(title_lengths) / len(title_lengths)
+        avg_title_length = sum_title_len / n_papers
         
         print(f"📝 Title Statistics:")
         print(f"  Average title length: {avg_title_length:.1f} characters")
-        print(f"  Shortest title: {min(title_lengths)} characters")
-        print(f"  Longest title: {max(title_lengths)} characters")
+        print(f"  Shortest title: {min_title_len} characters")
+        print(f"  Longest title: {max_title_len} characters")
         print()
         
         # Sample some papers
         print(f"📋 Sample Papers:")
-        for i, paper in enumerate(papers[:3], 1):
+        for i, paper in enumerate(sample, 1):
             print(f"  {i}. {paper['title']}")
             print(f"     Authors: {', '.join(paper['author_list'][:3])}{'...' if len(paper['author_list']) > 3 else ''}")
             print(f"     PDF: {'✓' if paper['doc_list']['pdf'] else '✗'}")
@@ -76,11 +157,17 @@ def main():
     parser = argparse.ArgumentParser(description='Analyze extracted CVPR 2024 paper data')
     parser.add_argument('--input', '-i',
                        default='cvpr2024_papers.json',
-                       help='Input JSON file (default: cvpr2024_papers.json)')
+                       help='Input JSON or JSON Lines (.jsonl) file (default: cvpr2024_papers.json)')
+    parser.add_argument('--approximate-authors',
+                       action='store_true',
+                       help='Count authors with a fixed-memory bounter counter (for multi-year corpora)')
+    parser.add_argument('--counter-size-mb', type=int,
+                       default=64,
+                       help='Memory budget in MB for --approximate-authors (default: 64)')
     
     args = parser.parse_args()
     
-    analyze_extracted_data(args.input)
+    analyze_extracted_data(args.input, args.approximate_authors, args.counter_size_mb)
 
 if __name__ == '__main__':
     main() 
\ No newline at end of file
@@ -2,34 +2,47 @@
 
 import argparse
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from urllib.parse import urlparse
 import sys
 from datetime import datetime
 
-def download_webpage(url: str, output_file: str = None) -> bool:
+# Shared session so repeated downloads reuse pooled keep-alive connections
+_session = requests.Session()
+_adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16,
+                       max_retries=Retry(total=3, backoff_factor=0.3))
+_session.mount('https://', _adapter)
+_session.mount('http://', _adapter)
+
+def download_webpage(url: str, output_file: str = None, session: requests.Session = _session) -> bool:
     """
     Download a webpage and save it to a file.
     
     Args:
         url (str): The URL to download
         output_file (str, optional): The output file path. If None, generates a filename based on timestamp.
+        session (requests.Session, optional): Session to download with (default: shared pooled session)
     
     Returns:
         bool: True if successful, False otherwise
     """
     try:
         # Send GET request to the URL
-        response = requests.get(url)
-        response.raise_for_status()  # Raise an exception for bad status codes
-        
-        # Generate output filename if not provided
-        if output_file is None:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            output_file = f"cvpr2024_{timestamp}.html"
-        
-        # Save the content to a file
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(response.text)
+        with session.get(url, stream=True) as response:
+            response.raise_for_status()  # Raise an exception for bad status codes
+            
+            # Generate output filename if not provided
+            if output_file is None:
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                output_file = f"cvpr2024_{timestamp}.html"
+            
+            # Stream the content to a file
+            with open(output_file, 'wb') as f:
+                for chunk in response.iter_content(65536):
+                    f.write(chunk)
         
         print(f"Successfully downloaded webpage to {output_file}")
         return True
@@ -41,18 +54,58 @@ def download_webpage(url: str, output_file: str = None) -> bool:
         print(f"Error saving file: {e}", file=sys.stderr)
         return False
 
+def download_many(urls: list, output_dir: str, workers: int = 16) -> int:
+    """
+    Download many URLs in parallel into a directory.
+    
+    Args:
+        urls (list): The URLs to download
+        output_dir (str): Directory to save the files to (named after the last URL path segment)
+        workers (int, optional): Number of download threads (default: 16)
+    
+    Returns:
+        int: Number of files downloaded successfully
+    """
+    out_dir = Path(output_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    
+    def download_one(indexed_url):
+        i, url = indexed_url
+        filename = Path(urlparse(url).path).name or f"download_{i + 1}.html"
+        return download_webpage(url, str(out_dir / filename))
+    
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(download_one, enumerate(urls)))
+    
+    return sum(results)
+
 def main():
     parser = argparse.ArgumentParser(description='Download CVPR 2024 webpage')
-    parser.add_argument('--url', 
+    parser.add_argument('--url',
                        default='https://openaccess.thecvf.com/CVPR2024?day=all',
                        help='URL to download (default: CVPR 2024 webpage)')
     parser.add_argument('--output', '-o',
                        help='Output file path (default: cvpr2024_YYYYMMDD_HHMMSS.html)')
+    parser.add_argument('--url-file',
+                       help='Text file with one URL per line to download in parallel (e.g. paper PDFs)')
+    parser.add_argument('--output-dir',
+                       default='downloads',
+                       help='Output directory for --url-file downloads (default: downloads)')
+    parser.add_argument('--workers', type=int,
+                       default=16,
+                       help='Number of parallel downloads for --url-file (default: 16)')
     
     args = parser.parse_args()
     
+    if args.url_file:
+        with open(args.url_file, 'r', encoding='utf-8') as f:
+            urls = [line.strip() for line in f if line.strip()]
+        downloaded = download_many(urls, args.output_dir, args.workers)
+        print(f"Downloaded {downloaded}/{len(urls)} files to {args.output_dir}")
+        sys.exit(0 if downloaded == len(urls) else 1)
+    
     success = download_webpage(args.url, args.output)
     sys.exit(0 if success else 1)
 
 if __name__ == '__main__':
-    main() 
\ No newline at end of file
+    main()
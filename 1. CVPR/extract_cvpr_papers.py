@@ -4,16 +4,154 @@ import argparse
 import json
 import re
 from pathlib import Path
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer, Tag
 import sys
 
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+CVF_BASE_URL = "https://openaccess.thecvf.com"
+
+def _assign_pdf(doc_list: dict, href: str) -> None:
+    """Record a paper PDF link."""
+    if '/papers/' in href:
+        doc_list["pdf"] = CVF_BASE_URL + href
+
+def _assign_supp(doc_list: dict, href: str) -> None:
+    """Record a supplemental material link."""
+    if '/supplemental/' in href:
+        doc_list["supp"] = CVF_BASE_URL + href
+
+def _assign_arxiv(doc_list: dict, href: str) -> None:
+    """Record an arXiv link."""
+    doc_list["arxiv"] = href
+
+# Document link handlers keyed by the lowercased link text
+LINK_HANDLERS = {
+    'pdf': _assign_pdf,
+    'supp': _assign_supp,
+    'arxiv': _assign_arxiv
+}
+
+def _new_paper_info(title_element) -> dict:
+    """
+    Create a paper record from a dt.ptitle element.
+    
+    Args:
+        title_element: The dt element holding the paper title link
+    
+    Returns:
+        dict: Paper record with title fields filled in
+    """
+    paper_info = {
+        "title": "",
+        "title_url": "",
+        "author_list": [],
+        "doc_list": {
+            "pdf": "",
+            "supp": "",
+            "arxiv": "",
+            "bibtex": ""
+        }
+    }
+    
+    # Extract title and title URL
+    title_link = title_element.find('a')
+    if title_link:
+        paper_info["title"] = title_link.get_text().strip()
+        paper_info["title_url"] = CVF_BASE_URL + title_link.get('href', '')
+    
+    return paper_info
+
+def _extract_dd_details(dd, paper_info: dict) -> bool:
+    """
+    Fill authors and document links from a dd element into paper_info.
+    
+    Args:
+        dd: A dd element following the paper title
+        paper_info (dict): Paper record to update
+    
+    Returns:
+        bool: True once the bibtex entry (the last part of a paper) is found
+    """
+    # Collect author inputs, links and the bibtex block in one walk of the subtree
+    author_inputs = []
+    links = []
+    bibref_div = None
+    for element in dd.descendants:
+        if type(element) is not Tag:
+            continue
+        name = element.name
+        if name == 'a':
+            links.append(element)
+        elif name == 'input':
+            form = element.parent
+            if (element.get('name') == 'query_author' and form.name == 'form'
+                    and 'authsearch' in (form.get('class') or [])):
+                author_inputs.append(element)
+        elif name == 'div' and bibref_div is None and 'bibref' in (element.get('class') or []):
+            bibref_div = element
+    
+    # Extract authors from forms
+    for author_input in author_inputs:
+        author_name = sys.intern(author_input.get('value', '').strip())
+        if author_name and author_name not in paper_info["author_list"]:
+            paper_info["author_list"].append(author_name)
+    
+    # Extract document links
+    for link in links:
+        # link.string avoids get_text()'s descendant walk for plain text links
+        text = link.string if link.string is not None else link.get_text()
+        handler = LINK_HANDLERS.get(text.strip().lower())
+        if handler:
+            handler(paper_info["doc_list"], link.get('href', ''))
+    
+    # Extract bibtex
+    if bibref_div:
+        paper_info["doc_list"]["bibtex"] = bibref_div.get_text().strip()
+        return True
+    return False
+
+def _append_paper(papers: list, paper_info: dict) -> None:
+    """Append paper_info to papers if it has at least a title and some authors."""
+    if paper_info and paper_info["title"] and paper_info["author_list"]:
+        papers.append(paper_info)
+
+class _JsonLinesWriter:
+    """List-like sink that writes each appended paper as one JSON line."""
+    
+    def __init__(self, f):
+        self.f = f
+        self.count = 0
+    
+    def append(self, paper_info: dict) -> None:
+        if orjson is not None:
+            self.f.write(orjson.dumps(paper_info, option=orjson.OPT_APPEND_NEWLINE))
+        else:
+            self.f.write((json.dumps(paper_info, ensure_ascii=False) + '\n').encode('utf-8'))
+        self.count += 1
+    
+    def __len__(self) -> int:
+        return self.count
+
 def extract_papers_from_html(html_file: str, output_file: str = None) -> bool:
     """
     Extract paper information from CVPR HTML file and save as JSON.
     
+    If output_file ends with .jsonl, each paper is written as one JSON line
+    as soon as it is parsed instead of being collected into a list first.
+    
     Args:
         html_file (str): Path to the HTML file
-        output_file (str, optional): Output JSON file path
+        output_file (str, optional): Output JSON or JSON Lines file path
     
     Returns:
         bool: True if successful, False otherwise
@@ -23,75 +161,44 @@ def extract_papers_from_html(html_file: str, output_file: str = None) -> bool:
         with open(html_file, 'r', encoding='utf-8') as f:
             html_content = f.read()
         
-        soup = BeautifulSoup(html_content, 'html.parser')
-        papers = []
-        
-        # Find all paper title elements
-        paper_titles = soup.find_all('dt', class_='ptitle')
-        
-        for title_element in paper_titles:
-            paper_info = {
-                "title": "",
-                "title_url": "",
-                "author_list": [],
-                "doc_list": {
-                    "pdf": "",
-                    "supp": "",
-                    "arxiv": "",
-                    "bibtex": ""
-                }
-            }
-            
-            # Extract title and title URL
-            title_link = title_element.find('a')
-            if title_link:
-                paper_info["title"] = title_link.get_text().strip()
-                paper_info["title_url"] = "https://openaccess.thecvf.com" + title_link.get('href', '')
-            
-            # Find the next dd elements for authors and links
-            next_elements = title_element.find_next_siblings(['dd'])
-            
-            for dd in next_elements:
-                # Extract authors from forms
-                author_forms = dd.find_all('form', class_='authsearch')
-                if author_forms:
-                    for form in author_forms:
-                        author_input = form.find('input', {'name': 'query_author'})
-                        if author_input:
-                            author_name = author_input.get('value', '').strip()
-                            if author_name and author_name not in paper_info["author_list"]:
-                                paper_info["author_list"].append(author_name)
-                
-                # Extract document links
-                links = dd.find_all('a')
-                for link in links:
-                    href = link.get('href', '')
-                    text = link.get_text().strip().lower()
-                    
-                    if text == 'pdf' and '/papers/' in href:
-                        paper_info["doc_list"]["pdf"] = "https://openaccess.thecvf.com" + href
-                    elif text == 'supp' and '/supplemental/' in href:
-                        paper_info["doc_list"]["supp"] = "https://openaccess.thecvf.com" + href
-                    elif text == 'arxiv':
-                        paper_info["doc_list"]["arxiv"] = href
-                
-                # Extract bibtex
-                bibref_div = dd.find('div', class_='bibref')
-                if bibref_div:
-                    paper_info["doc_list"]["bibtex"] = bibref_div.get_text().strip()
-                    break  # Found the complete paper info, move to next paper
-            
-            # Only add papers that have at least title and some authors
-            if paper_info["title"] and paper_info["author_list"]:
-                papers.append(paper_info)
+        # Only the dt/dd entries of the paper list are needed
+        strainer = SoupStrainer(['dt', 'dd'])
+        soup = BeautifulSoup(html_content, HTML_PARSER, parse_only=strainer)
         
         # Generate output filename if not provided
         if output_file is None:
             output_file = "cvpr2024_papers.json"
         
-        # Save to JSON file
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(papers, f, indent=2, ensure_ascii=False)
+        jsonl_file = open(output_file, 'wb') if output_file.endswith('.jsonl') else None
+        papers = _JsonLinesWriter(jsonl_file) if jsonl_file else []
+        
+        # Walk the dt/dd entries once, assigning each dd to the most recent title
+        paper_info = None
+        paper_complete = False
+        try:
+            for element in soup.find_all(['dt', 'dd'], recursive=False):
+                if element.name == 'dt':
+                    if 'ptitle' not in (element.get('class') or []):
+                        continue
+                    _append_paper(papers, paper_info)
+                    paper_info = _new_paper_info(element)
+                    paper_complete = False
+                elif paper_info is not None and not paper_complete:
+                    paper_complete = _extract_dd_details(element, paper_info)
+            
+            _append_paper(papers, paper_info)
+        finally:
+            if jsonl_file:
+                jsonl_file.close()
+        
+        # Save to JSON file (JSON Lines output was already streamed)
+        if jsonl_file is None:
+            if orjson is not None:
+                with open(output_file, 'wb') as f:
+                    f.write(orjson.dumps(papers, option=orjson.OPT_INDENT_2))
+            else:
+                with open(output_file, 'w', encoding='utf-8') as f:
+                    json.dump(papers, f, indent=2, ensure_ascii=False)
         
         print(f"Successfully extracted {len(papers)} papers to {output_file}")
         return True
@@ -106,7 +213,7 @@ def main():
                        default='cvpr2024.html',
                        help='Input HTML file (default: cvpr2024.html)')
     parser.add_argument('--output', '-o',
-                       help='Output JSON file (default: cvpr2024_papers.json)')
+                       help='Output JSON file, or .jsonl to stream JSON Lines (default: cvpr2024_papers.json)')
     
     args = parser.parse_args()
     
@@ -11,21 +11,85 @@ Usage:
 
 import argparse
 import asyncio
+import logging
 import os
 import sys
 import time
+import random
+import re
 import aiohttp
+import aiofiles
 from pathlib import Path
-from urllib.parse import urlparse, urljoin
+from urllib.parse import urljoin
+from functools import lru_cache
 from playwright.async_api import async_playwright
 import json
 from datetime import datetime, timedelta
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
+
+INSTAGRAM_URL_PREFIX = 'https://www.instagram.com/'
+
+# First element to render on a profile: its header or post grid, or the "page isn't available" notice
+PROFILE_LANDING_SELECTOR = 'header section, article, a[href*="/p/"], h2:has-text("Sorry, this page")'
+
+# Only rendered once logged in; the login page itself has a logo link to "/"
+LOGGED_IN_SELECTOR = 'nav[role="navigation"] svg[aria-label="Home"]'
+
+# Extra launch flags, Chromium only
+CHROMIUM_ARGS = ['--no-sandbox', '--disable-blink-features=AutomationControlled']
+
+# Number of posts opened in parallel, each in its own page
+POST_CONCURRENCY = 6
+
+# Number of images downloaded in parallel and the read size per chunk
+DOWNLOAD_CONCURRENCY = 8
+DOWNLOAD_CHUNK_SIZE = 131072
+DOWNLOAD_TIMEOUT = aiohttp.ClientTimeout(total=60, sock_read=30)
+
+# Per-profile sidecar of url -> ETag, used to skip unchanged images on re-runs
+ETAGS_FILE = '.etags.json'
+
+# Saved cookies are reused for this long, judged by the cookie file's mtime
+COOKIE_MAX_AGE = 30 * 86400
+
+# Selector-list for images inside an opened post, queried in one DOM pass
+CAROUSEL_IMAGE_SELECTOR = (
+    'article img[src*="instagram"], '
+    'img[src*="cdninstagram"], '
+    'img[src*="scontent"], '
+    'div[role="button"] img'
+)
+
+# Carousel "Next" control
+CAROUSEL_NEXT_SELECTOR = 'button[aria-label*="Next"], div[role="button"][aria-label*="Next"]'
+
+# Returns the src attribute of every element matching the selector
+JS_GET_IMAGE_SRCS = """(selector) => Array.from(
+    document.querySelectorAll(selector), el => el.getAttribute('src')
+)"""
+
+# Element counts used to detect when new content has been added to the DOM
+JS_COUNT_POST_IMAGES = "() => document.querySelectorAll('article img').length"
+JS_COUNT_POST_LINKS = "() => document.querySelectorAll('a[href*=\"/p/\"]').length"
+
+# Image host check and thumbnail/profile picture filter, applied to every src
+_IG_HOST_RE = re.compile(r'instagram|scontent')
+_SKIP_RE = re.compile(r'profile_pic|150x150|320x320')
+
+log = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=1024)
 def extract_username_from_url(url):
     """Extract Instagram username from URL"""
-    if url.startswith('https://www.instagram.com/'):
-        path = urlparse(url).path
+    if url.startswith(INSTAGRAM_URL_PREFIX):
+        # Slice off the prefix, query and fragment instead of running urlparse
+        path = url[len(INSTAGRAM_URL_PREFIX):].split('?', 1)[0].split('#', 1)[0]
         username = path.strip('/').split('/')[0]
         return username
     return url
@@ -38,11 +102,18 @@ async def save_cookies(context, cookie_file="instagram_cookies.json"):
         cookie_data = {
             'cookies': cookies,
             'saved_at': datetime.now().isoformat(),
-            'expires_at': (datetime.now() + timedelta(days=30)).isoformat()
+            'expires_at': (datetime.now() + timedelta(seconds=COOKIE_MAX_AGE)).isoformat()
         }
         
-        with open(cookie_file, 'w') as f:
-            json.dump(cookie_data, f, indent=2)
+        # Write a temp file and swap it in, so a crash never leaves a half-written cookie file
+        tmp_file = cookie_file + '.tmp'
+        if orjson is not None:
+            with open(tmp_file, 'wb') as f:
+                f.write(orjson.dumps(cookie_data))
+        else:
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(cookie_data, f, ensure_ascii=False)
+        os.replace(tmp_file, cookie_file)
         
         print(f"🍪 Cookies saved to {cookie_file}")
         return True
@@ -54,25 +125,26 @@ async def save_cookies(context, cookie_file="instagram_cookies.json"):
 async def load_cookies(context, cookie_file="instagram_cookies.json"):
     """Load browser cookies from file"""
     try:
-        if not os.path.exists(cookie_file):
+        # One stat answers both "does it exist" and "is it expired"
+        try:
+            saved_at = os.stat(cookie_file).st_mtime
+        except FileNotFoundError:
             print(f"📄 No cookie file found at {cookie_file}")
             return False
         
-        with open(cookie_file, 'r') as f:
-            cookie_data = json.load(f)
-        
-        # Check if cookies are expired
-        expires_at = datetime.fromisoformat(cookie_data['expires_at'])
-        if datetime.now() > expires_at:
+        # Check if cookies are expired before reading the file
+        if saved_at + COOKIE_MAX_AGE < time.time():
             print(f"⏰ Cookies expired, removing old cookie file")
             os.remove(cookie_file)
             return False
         
+        with open(cookie_file, 'rb') as f:
+            cookie_data = orjson.loads(f.read()) if orjson is not None else json.load(f)
+        
         # Load cookies into context
         await context.add_cookies(cookie_data['cookies'])
         
-        saved_at = datetime.fromisoformat(cookie_data['saved_at'])
-        print(f"🍪 Loaded cookies from {saved_at.strftime('%Y-%m-%d %H:%M')}")
+        print(f"🍪 Loaded cookies from {datetime.fromtimestamp(saved_at).strftime('%Y-%m-%d %H:%M')}")
         return True
         
     except Exception as e:
@@ -80,20 +152,112 @@ async def load_cookies(context, cookie_file="instagram_cookies.json"):
         return False
 
 
-async def download_image(session, url, filepath):
-    """Download image from URL using aiohttp"""
+async def download_image(session, url, filepath, etags=None):
+    """
+    Download image from URL using aiohttp
+    
+    Args:
+        session: aiohttp ClientSession
+        url (str): Image URL
+        filepath (Path): Where to save the image
+        etags (dict, optional): url -> {'etag', 'file'} from earlier runs; updated in place
+    
+    Returns:
+        bool: True if the image was downloaded or is already on disk unchanged
+    """
     try:
-        async with session.get(url) as response:
+        # Revalidate instead of re-downloading when an earlier run saved this URL
+        headers = {}
+        cached = etags.get(url) if etags is not None else None
+        cached_file = filepath.parent / cached['file'] if cached else None
+        if cached_file and not cached_file.exists():
+            cached_file = None
+        if cached_file and cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        
+        async with session.get(url, headers=headers) as response:
+            if response.status == 304:
+                return True
             if response.status == 200:
-                content = await response.read()
-                with open(filepath, 'wb') as f:
-                    f.write(content)
+                # Same size as the copy from an earlier run: skip the body (CDNs that ignore If-None-Match)
+                if cached_file and response.content_length is not None \
+                        and cached_file.stat().st_size == response.content_length:
+                    return True
+                
+                # Stream to disk so only one chunk per download is held in memory
+                async with aiofiles.open(filepath, 'wb') as f:
+                    async for chunk in response.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                        await f.write(chunk)
+                if etags is not None:
+                    etags[url] = {'etag': response.headers.get('ETag'), 'file': filepath.name}
                 return True
     except Exception as e:
         print(f"❌ Failed to download {url}: {str(e)}")
     return False
 
 
+def load_etags(user_dir):
+    """
+    Load the url -> ETag sidecar written by earlier runs for a profile
+    
+    Args:
+        user_dir (Path): Profile download directory
+    
+    Returns:
+        dict: url -> {'etag', 'file'}, empty if there is no usable sidecar
+    """
+    try:
+        with open(user_dir / ETAGS_FILE, 'rb') as f:
+            return orjson.loads(f.read()) if orjson is not None else json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_etags(user_dir, etags):
+    """
+    Save the url -> ETag sidecar for the next run
+    
+    Args:
+        user_dir (Path): Profile download directory
+        etags (dict): url -> {'etag', 'file'}
+    """
+    # Temp file + rename, so an interrupted run never leaves a truncated sidecar
+    tmp_file = user_dir / (ETAGS_FILE + '.tmp')
+    try:
+        if orjson is not None:
+            with open(tmp_file, 'wb') as f:
+                f.write(orjson.dumps(etags))
+        else:
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(etags, f)
+        os.replace(tmp_file, user_dir / ETAGS_FILE)
+    except OSError as e:
+        print(f"⚠️  Failed to save {ETAGS_FILE}: {str(e)}")
+
+
+async def wait_for_profile(page, username, timeout=15000):
+    """
+    Wait for the profile grid or Instagram's "page isn't available" notice, whichever renders first
+    
+    Args:
+        page: Playwright page that just navigated to the profile
+        username (str): Instagram username, for the error message
+        timeout (int): Maximum wait in milliseconds
+    
+    Returns:
+        bool: False if the profile does not exist, True otherwise
+    """
+    try:
+        landing = await page.wait_for_selector(PROFILE_LANDING_SELECTOR, timeout=timeout)
+    except Exception:
+        return True  # Neither rendered in time; the later checks decide
+    
+    if await landing.evaluate('el => el.tagName') == 'H2':
+        print(f"❌ Profile '{username}' does not exist or is not accessible")
+        return False
+    return True
+
+
 async def login_to_instagram(page, context, save_cookies_after=True):
     """Handle Instagram login process"""
     try:
@@ -101,7 +265,6 @@ async def login_to_instagram(page, context, save_cookies_after=True):
         
         # Navigate to Instagram login page
         await page.goto("https://www.instagram.com/accounts/login/", wait_until='networkidle', timeout=30000)
-        await page.wait_for_timeout(3000)
         
         print("📝 Please log in to your Instagram account in the browser window that opened.")
         print("⏳ Waiting for you to complete the login process...")
@@ -114,26 +277,15 @@ async def login_to_instagram(page, context, save_cookies_after=True):
         login_timeout = 300000  # 5 minutes timeout for manual login
         
         try:
-            # Wait for either the home page or profile elements to appear
-            await page.wait_for_selector(
-                'svg[aria-label="Home"], a[href="/"], nav[role="navigation"]', 
-                timeout=login_timeout
-            )
+            # Wait for the Home icon in the navigation bar
+            await page.locator(LOGGED_IN_SELECTOR).first.wait_for(timeout=login_timeout)
+            print("✅ Login successful! Detected main Instagram page.")
             
-            # Additional check - make sure we're not still on login page
-            current_url = page.url
-            if 'login' not in current_url.lower():
-                print("✅ Login successful! Detected main Instagram page.")
-                await page.wait_for_timeout(2000)  # Wait a bit more for page to stabilize
-                
-                # Save cookies after successful login
-                if save_cookies_after:
-                    await save_cookies(context)
-                
-                return True
-            else:
-                print("❌ Still on login page. Please complete the login process.")
-                return False
+            # Save cookies after successful login
+            if save_cookies_after:
+                await save_cookies(context)
+            
+            return True
                 
         except Exception as e:
             print(f"⏰ Login timeout after 5 minutes. Please try again.")
@@ -144,6 +296,26 @@ async def login_to_instagram(page, context, save_cookies_after=True):
         return False
 
 
+async def _collect_images(page, images_found):
+    """
+    Add the full-size post image URLs visible on the page to images_found
+    
+    Args:
+        page: Playwright page object
+        images_found: Set of image URLs to update in place
+    """
+    try:
+        # Read every src in one round-trip instead of one get_attribute call per element
+        srcs = await page.evaluate(JS_GET_IMAGE_SRCS, CAROUSEL_IMAGE_SELECTOR)
+    except Exception:
+        return
+    
+    for src in srcs:
+        # Keep Instagram CDN images, skip profile pictures and small thumbnails
+        if src and _IG_HOST_RE.search(src) and not _SKIP_RE.search(src):
+            images_found.add(src)
+
+
 async def extract_carousel_images(page, post_url):
     """
     Click into a post and extract all carousel images
@@ -158,49 +330,29 @@ async def extract_carousel_images(page, post_url):
     carousel_images = []
     
     try:
-        print(f"   🔍 Opening post: {post_url}")
+        log.debug("   🔍 Opening post: %s", post_url)
         
-        # Open the post in the same page
+        # Open the post
         await page.goto(post_url, wait_until='domcontentloaded', timeout=30000)
-        await page.wait_for_timeout(3000)  # Wait for images to load
+        try:
+            # Continue as soon as the post image is in the DOM
+            await page.wait_for_selector('article img', timeout=5000)
+        except Exception:
+            pass  # Video-only or slow posts: extract whatever is there
         
         # Look for carousel indicators (dots) or next/prev buttons
-        carousel_indicators = await page.query_selector_all('div[role="button"][aria-label*="Next"], button[aria-label*="Next"]')
-        
-        # Try to find all images in the current post view
-        image_selectors = [
-            'article img[src*="instagram"]',
-            'img[src*="cdninstagram"]',
-            'img[src*="scontent"]',
-            'div[role="button"] img'
-        ]
+        carousel_indicators = await page.query_selector_all(CAROUSEL_NEXT_SELECTOR)
         
         images_found = set()
         
         # Extract current visible images
-        for selector in image_selectors:
-            try:
-                post_images = await page.query_selector_all(selector)
-                for img in post_images:
-                    try:
-                        src = await img.get_attribute('src')
-                        if src and ('instagram' in src or 'cdninstagram' in src or 'scontent' in src):
-                            # Skip small thumbnails
-                            skip_patterns = ['profile_pic', '150x150', '320x320', 's150x150', 's320x320']
-                            should_skip = any(pattern in src for pattern in skip_patterns)
-                            
-                            if not should_skip:
-                                images_found.add(src)
-                    except:
-                        continue
-            except:
-                continue
+        await _collect_images(page, images_found)
         
-        print(f"   📸 Found {len(images_found)} images in first view")
+        log.debug("   📸 Found %d images in first view", len(images_found))
         
         # If there are carousel indicators, try clicking through them
         if carousel_indicators:
-            print(f"   🎠 Detected carousel with {len(carousel_indicators)} navigation elements")
+            log.debug("   🎠 Detected carousel with %d navigation elements", len(carousel_indicators))
             
             # Click through the carousel to find more images
             max_clicks = 10  # Prevent infinite loops
@@ -209,28 +361,20 @@ async def extract_carousel_images(page, post_url):
             while clicks < max_clicks:
                 try:
                     # Try to find and click next button
-                    next_button = await page.query_selector('button[aria-label*="Next"], div[role="button"][aria-label*="Next"]')
+                    next_button = await page.query_selector(CAROUSEL_NEXT_SELECTOR)
                     if next_button:
+                        prev_count = await page.evaluate(JS_COUNT_POST_IMAGES)
                         await next_button.click()
-                        await page.wait_for_timeout(2000)  # Wait for new image to load
+                        try:
+                            # Wait until the next slide's image is added to the DOM
+                            await page.wait_for_function(
+                                f"n => ({JS_COUNT_POST_IMAGES})() > n", arg=prev_count, timeout=5000
+                            )
+                        except Exception:
+                            pass  # Slide reused an existing element; collect what is there
                         
                         # Extract images from new view
-                        for selector in image_selectors:
-                            try:
-                                post_images = await page.query_selector_all(selector)
-                                for img in post_images:
-                                    try:
-                                        src = await img.get_attribute('src')
-                                        if src and ('instagram' in src or 'cdninstagram' in src or 'scontent' in src):
-                                            skip_patterns = ['profile_pic', '150x150', '320x320', 's150x150', 's320x320']
-                                            should_skip = any(pattern in src for pattern in skip_patterns)
-                                            
-                                            if not should_skip:
-                                                images_found.add(src)
-                                    except:
-                                        continue
-                            except:
-                                continue
+                        await _collect_images(page, images_found)
                         
                         clicks += 1
                     else:
@@ -241,7 +385,7 @@ async def extract_carousel_images(page, post_url):
                     break
         
         carousel_images = list(images_found)
-        print(f"   ✅ Total carousel images: {len(carousel_images)}")
+        log.debug("   ✅ Total carousel images: %d", len(carousel_images))
         
     except Exception as e:
         print(f"   ❌ Error extracting carousel: {str(e)}")
@@ -249,159 +393,246 @@ async def extract_carousel_images(page, post_url):
     return carousel_images
 
 
-async def scrape_instagram_with_carousel(username, count=5, output_dir="downloads", headless=True, login_first=False, use_cookies=True):
+async def _open_context(p, headless=True, engine='chromium'):
     """
-    Scrape Instagram with carousel support for more images
+    Launch a browser and create a browser context with realistic settings
+    
+    Args:
+        p: Playwright instance
+        headless: Run browser in headless mode
+        engine: Playwright browser engine (chromium, firefox or webkit)
+    
+    Returns:
+        tuple: (browser, context)
+    """
+    print(f"🚀 Launching {engine}...")
+    
+    # These flags are Chromium switches; firefox and webkit do not understand them
+    args = CHROMIUM_ARGS if engine == 'chromium' else []
+    browser = await getattr(p, engine).launch(headless=headless, args=args)
+    
+    # Create context with realistic user agent
+    context = await browser.new_context(
+        viewport={'width': 1366, 'height': 768},
+        user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+    )
+    
+    return browser, context
+
+
+async def _prepare_session(page, context, login_first=False, use_cookies=True):
+    """
+    Restore saved cookies and log in if needed
+    
+    Returns:
+        bool: True if the session is ready for scraping
+    """
+    # Try to load saved cookies first
+    cookies_loaded = False
+    if use_cookies:
+        cookies_loaded = await load_cookies(context)
+    
+    # Handle login if requested or if cookies failed to load
+    needs_login = login_first or (use_cookies and not cookies_loaded)
+    
+    if needs_login:
+        login_success = await login_to_instagram(page, context, save_cookies_after=use_cookies)
+        if not login_success:
+            print("❌ Login failed or was cancelled. Cannot proceed.")
+            return False
+        print("🎉 Login completed! Proceeding with download...")
+    elif cookies_loaded:
+        print("🍪 Using saved cookies, skipping login!")
+    
+    return True
+
+
+async def _scrape_user(context, page, username, count=5, output_dir="downloads"):
+    """
+    Scrape one profile with carousel support using an already prepared context
+    
+    Returns:
+        tuple: (success, downloaded_count)
     """
     
     # Create output directory
     user_dir = Path(output_dir) / username
     user_dir.mkdir(parents=True, exist_ok=True)
     
-    async with async_playwright() as p:
-        print("🚀 Launching browser...")
-        
-        # Launch browser with realistic settings
-        browser = await p.chromium.launch(
-            headless=headless,
-            args=[
-                '--no-sandbox',
-                '--disable-blink-features=AutomationControlled',
-                '--disable-web-security', 
-                '--disable-features=VizDisplayCompositor'
-            ]
-        )
-        
-        # Create context with realistic user agent
-        context = await browser.new_context(
-            viewport={'width': 1366, 'height': 768},
-            user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        )
+    try:
+        print(f"🔍 Navigating to Instagram profile: {username}")
         
-        page = await context.new_page()
+        # Navigate to Instagram profile
+        profile_url = f"https://www.instagram.com/{username}/"
+        print(f"   Loading profile URL: {profile_url}")
+        await page.goto(profile_url, wait_until='commit', timeout=30000)
+        print("   Navigation committed, waiting for content...")
+        # A missing profile bails out here; a slow grid is handled by the "No posts found" check
+        if not await wait_for_profile(page, username):
+            return False, 0
         
-        try:
-            # Try to load saved cookies first
-            cookies_loaded = False
-            if use_cookies:
-                cookies_loaded = await load_cookies(context)
-            
-            # Handle login if requested or if cookies failed to load
-            needs_login = login_first or (use_cookies and not cookies_loaded)
-            
-            if needs_login:
-                login_success = await login_to_instagram(page, context, save_cookies_after=use_cookies)
-                if not login_success:
-                    print("❌ Login failed or was cancelled. Cannot proceed.")
-                    return False, 0
-                print("🎉 Login completed! Proceeding with download...")
-            elif cookies_loaded:
-                print("🍪 Using saved cookies, skipping login!")
-            
-            print(f"🔍 Navigating to Instagram profile: {username}")
-            
-            # Navigate to Instagram profile
-            profile_url = f"https://www.instagram.com/{username}/"
-            print(f"   Loading profile URL: {profile_url}")
-            await page.goto(profile_url, wait_until='domcontentloaded', timeout=60000)
-            print("   Profile page loaded, waiting for content...")
-            await page.wait_for_timeout(5000)
-            
-            # Scroll to load posts
-            print("📜 Scrolling to load posts...")
-            for i in range(5):  # Less scrolling since we'll extract more per post
-                await page.evaluate('window.scrollTo(0, document.body.scrollHeight)')
-                await page.wait_for_timeout(3000)
-            
-            # Find all post links
-            print("🔗 Finding post links...")
-            post_links = await page.query_selector_all('a[href*="/p/"]')
-            print(f"   Found {len(post_links)} posts")
-            
-            if not post_links:
-                print("❌ No posts found on this profile")
-                return False, 0
-            
-            # Extract URLs from post links
-            post_urls = []
-            for link in post_links:
+        # Scroll to load posts
+        print("📜 Scrolling to load posts...")
+        for i in range(5):  # Less scrolling since we'll extract more per post
+            prev_count = await page.evaluate(JS_COUNT_POST_LINKS)
+            await page.evaluate('window.scrollTo(0, document.body.scrollHeight)')
+            try:
+                # Continue as soon as the scroll has loaded more posts
+                await page.wait_for_function(
+                    f"n => ({JS_COUNT_POST_LINKS})() > n", arg=prev_count, timeout=3000
+                )
+            except Exception:
+                break  # Nothing new loaded, the grid is exhausted
+        
+        # Find all post links
+        print("🔗 Finding post links...")
+        post_links = await page.query_selector_all('a[href*="/p/"]')
+        print(f"   Found {len(post_links)} posts")
+        
+        if not post_links:
+            print("❌ No posts found on this profile")
+            return False, 0
+        
+        # Extract URLs from post links
+        post_urls = []
+        for link in post_links:
+            try:
+                href = await link.get_attribute('href')
+                if href and '/p/' in href:
+                    if not href.startswith('http'):
+                        href = f"https://www.instagram.com{href}"
+                    post_urls.append(href)
+            except:
+                continue
+        
+        print(f"🎯 Processing {len(post_urls)} post URLs...")
+        
+        # Process posts concurrently, each worker on its own page
+        all_images = []
+        processed_posts = 0
+        semaphore = asyncio.Semaphore(POST_CONCURRENCY)
+        
+        async def process_post(post_url):
+            async with semaphore:
+                post_page = await context.new_page()
                 try:
-                    href = await link.get_attribute('href')
-                    if href and '/p/' in href:
-                        if not href.startswith('http'):
-                            href = f"https://www.instagram.com{href}"
-                        post_urls.append(href)
-                except:
-                    continue
-            
-            print(f"🎯 Processing {len(post_urls)} post URLs...")
-            
-            # Process each post to extract carousel images
-            all_images = []
-            processed_posts = 0
-            
-            for i, post_url in enumerate(post_urls):
-                if len(all_images) >= count:
-                    print(f"   ✅ Reached target of {count} images, stopping")
-                    break
-                
-                print(f"📱 Processing post {i+1}/{len(post_urls)}")
-                carousel_images = await extract_carousel_images(page, post_url)
+                    return await extract_carousel_images(post_page, post_url)
+                finally:
+                    await post_page.close()
+        
+        tasks = [asyncio.create_task(process_post(post_url)) for post_url in post_urls]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                carousel_images = await next_done
                 
                 all_images.extend(carousel_images)
                 processed_posts += 1
                 
-                print(f"   Running total: {len(all_images)} images from {processed_posts} posts")
+                log.debug("📱 Processed post %d/%d", processed_posts, len(post_urls))
+                log.debug("   Running total: %d images from %d posts", len(all_images), processed_posts)
                 
-                # Go back to profile for next post
-                await page.goto(profile_url, wait_until='domcontentloaded', timeout=30000)
-                await page.wait_for_timeout(2000)
-            
-            print(f"🎉 Collected {len(all_images)} total images from {processed_posts} posts")
-            
-            # Limit to requested count
-            download_images = all_images[:count]
-            
-            # Download images
-            print(f"⬇️  Starting download of {len(download_images)} images...")
-            
-            downloaded = 0
-            async with aiohttp.ClientSession() as session:
-                for i, img_url in enumerate(download_images):
-                    try:
-                        # Generate filename
-                        timestamp = int(time.time())
-                        filename = f"{username}_carousel_{timestamp}_{i+1}.jpg"
-                        filepath = user_dir / filename
-                        
-                        print(f"📥 Downloading image {i+1}/{len(download_images)}: {filename}")
-                        
-                        # Download image
-                        success = await download_image(session, img_url, filepath)
-                        if success:
-                            downloaded += 1
-                            print(f"✅ Downloaded: {filename}")
-                        
-                        # Add delay between downloads
-                        if i < len(download_images) - 1:
-                            delay = 1.5
-                            await asyncio.sleep(delay)
-                            
-                    except Exception as e:
-                        print(f"⚠️  Failed to download image {i+1}: {str(e)}")
-                        continue
+                if len(all_images) >= count:
+                    print(f"   ✅ Reached target of {count} images, stopping")
+                    break
+        finally:
+            # Stop any posts still queued or in flight
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        
+        print(f"🎉 Collected {len(all_images)} total images from {processed_posts} posts")
+        
+        # Limit to requested count
+        download_images = all_images[:count]
+        
+        # Download images
+        print(f"⬇️  Starting download of {len(download_images)} images...")
+        
+        semaphore = asyncio.Semaphore(DOWNLOAD_CONCURRENCY)
+        etags = load_etags(user_dir)
+        connector = aiohttp.TCPConnector(limit=DOWNLOAD_CONCURRENCY * 2, limit_per_host=DOWNLOAD_CONCURRENCY)
+        
+        # One timestamp for the whole batch; the index keeps filenames unique
+        timestamp = int(time.time())
+        
+        async def download_one(session, i, img_url):
+            async with semaphore:
+                try:
+                    # Generate filename
+                    filename = f"{username}_carousel_{timestamp}_{i+1}.jpg"
+                    filepath = user_dir / filename
+                    
+                    log.debug("📥 Downloading image %d/%d: %s", i + 1, len(download_images), filename)
+                    
+                    # Download image
+                    success = await download_image(session, img_url, filepath, etags)
+                    if success:
+                        log.debug("✅ Downloaded: %s", filename)
+                    
+                    # Small jittered delay per worker instead of a fixed serial pause
+                    await asyncio.sleep(random.uniform(0.1, 0.4))
+                    return success
+                    
+                except Exception as e:
+                    print(f"⚠️  Failed to download image {i+1}: {str(e)}")
+                    return False
+        
+        async with aiohttp.ClientSession(connector=connector, timeout=DOWNLOAD_TIMEOUT) as session:
+            results = await asyncio.gather(
+                *(download_one(session, i, img_url) for i, img_url in enumerate(download_images))
+            )
+        downloaded = sum(1 for success in results if success)
+        save_etags(user_dir, etags)
+        
+        print(f"🎉 Successfully downloaded {downloaded} images to '{user_dir}'")
+        return True, downloaded
+        
+    except Exception as e:
+        print(f"❌ Error during scraping: {str(e)}")
+        return False, 0
+
+
+async def scrape_many(usernames, count=5, output_dir="downloads", headless=True, login_first=False, use_cookies=True, engine='chromium'):
+    """
+    Scrape several profiles with one browser launch and one cookie/login setup
+    
+    Args:
+        usernames (list): Instagram usernames
+        count (int): Number of images to download per profile
+        output_dir (str): Directory to save downloads
+        headless (bool): Run browser in headless mode
+        engine (str): Playwright browser engine (chromium, firefox or webkit)
+    
+    Returns:
+        dict: username -> (success, downloaded_count)
+    """
+    results = {}
+    
+    async with async_playwright() as p:
+        browser, context = await _open_context(p, headless, engine)
+        page = await context.new_page()
+        
+        try:
+            if not await _prepare_session(page, context, login_first, use_cookies):
+                return {username: (False, 0) for username in usernames}
             
-            print(f"🎉 Successfully downloaded {downloaded} images to '{user_dir}'")
-            return True, downloaded
+            for username in usernames:
+                results[username] = await _scrape_user(context, page, username, count, output_dir)
             
-        except Exception as e:
-            print(f"❌ Error during scraping: {str(e)}")
-            return False, 0
+            return results
             
         finally:
             await browser.close()
 
 
+async def scrape_instagram_with_carousel(username, count=5, output_dir="downloads", headless=True, login_first=False, use_cookies=True, engine='chromium'):
+    """
+    Scrape Instagram with carousel support for more images
+    """
+    results = await scrape_many([username], count, output_dir, headless, login_first, use_cookies, engine)
+    return results[username]
+
+
 async def main_async(args):
     """Async main function"""
     
@@ -410,43 +641,48 @@ async def main_async(args):
         print("❌ Error: Either --username or --url is required")
         return False
     
-    # Extract username
+    # Extract usernames
     if args.url:
         username = extract_username_from_url(args.url)
         if not username:
             print("❌ Error: Could not extract username from URL")
             return False
+        usernames = [username]
     else:
-        username = args.username
+        usernames = args.username
     
     print(f"🚀 Instagram Carousel Picture Downloader")
-    print(f"👤 Target: {username}")
+    print(f"👤 Target: {', '.join(usernames)}")
     print(f"📊 Count: {args.count}")
-    print(f"👀 Headless: {'No' if args.show_browser else 'Yes'}")
+    print(f"👀 Headless: {'No' if args.show_browser else 'Yes'} ({args.engine})")
     print(f"🔐 Login: {'Yes' if args.login else 'Auto'}")
     print(f"🍪 Cookies: {'Disabled' if args.no_cookies else 'Enabled'}")
     print(f"📁 Output: {args.output_dir}")
     print("-" * 60)
     
-    # Download images
-    success, downloaded = await scrape_instagram_with_carousel(
-        username=username,
+    # Download images, sharing one browser across all profiles
+    results = await scrape_many(
+        usernames=usernames,
         count=args.count,
         output_dir=args.output_dir,
         headless=not args.show_browser,
         login_first=args.login,
-        use_cookies=not args.no_cookies
+        use_cookies=not args.no_cookies,
+        engine=args.engine
     )
     
     # Results
     print("-" * 60)
-    if success and downloaded > 0:
-        print(f"🎉 Successfully downloaded {downloaded} images (including carousel images)!")
-        print(f"📁 Check: {args.output_dir}/{username}/")
-        return True
-    else:
-        print("💥 Download failed!")
-        return False
+    all_ok = True
+    for username in usernames:
+        success, downloaded = results.get(username, (False, 0))
+        if success and downloaded > 0:
+            print(f"🎉 Successfully downloaded {downloaded} images (including carousel images)!")
+            print(f"📁 Check: {args.output_dir}/{username}/")
+        else:
+            print(f"💥 Download failed for {username}!")
+            all_ok = False
+    return all_ok
 
 
 def main():
@@ -457,14 +693,15 @@ def main():
         epilog="""
 Examples:
   %(prog)s --username grapeot --count 100 --show-browser
+  %(prog)s --username grapeot another_user --count 50
   %(prog)s --url https://www.instagram.com/grapeot/ --count 200 --login
         """
     )
     
     # Input options
     input_group = parser.add_mutually_exclusive_group(required=False)
-    input_group.add_argument('--username', '-u', type=str, 
-                           help='Instagram username')
+    input_group.add_argument('--username', '-u', type=str, nargs='+',
+                           help='Instagram username(s); several profiles share one browser session')
     input_group.add_argument('--url', type=str,
                            help='Instagram profile URL')
     
@@ -475,14 +712,28 @@ Examples:
                        help='Output directory (default: downloads)')
     parser.add_argument('--show-browser', action='store_true',
                        help='Show browser window (useful for debugging)')
+    parser.add_argument('--engine', choices=['chromium', 'firefox', 'webkit'], default='chromium',
+                       help='Browser engine to run (default: chromium)')
     parser.add_argument('--login', action='store_true',
                        help='Login to Instagram first (recommended for better access)')
     parser.add_argument('--no-cookies', action='store_true',
                        help='Disable cookie saving/loading (always login)')
+    parser.add_argument('--verbose', '-v', action='store_true',
+                       help='Print per-scroll and per-image progress')
     
     # Parse arguments
     args = parser.parse_args()
     
+    # Per-image and per-scroll progress is logged at DEBUG, shown only with --verbose.
+    # Only this script's logger goes to DEBUG, so libraries stay at INFO
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(message)s',
+        handlers=[logging.StreamHandler(sys.stdout)]
+    )
+    if args.verbose:
+        log.setLevel(logging.DEBUG)
+    
     # Run async main
     try:
         success = asyncio.run(main_async(args))
@@ -12,21 +12,104 @@ Usage:
 
 import argparse
 import asyncio
+import logging
 import os
+import random
+import re
 import sys
 import time
 import aiohttp
+import aiofiles
 from pathlib import Path
-from urllib.parse import urlparse, urljoin
+from urllib.parse import urljoin
+from functools import lru_cache
 from playwright.async_api import async_playwright
 import json
 from datetime import datetime, timedelta
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
+
+INSTAGRAM_URL_PREFIX = 'https://www.instagram.com/'
+
+# First element to render on a profile: its header or post grid, or the "page isn't available" notice
+PROFILE_LANDING_SELECTOR = 'header section, article, a[href*="/p/"], h2:has-text("Sorry, this page")'
+
+# Only rendered once logged in; the login page itself has a logo link to "/"
+LOGGED_IN_SELECTOR = 'nav[role="navigation"] svg[aria-label="Home"]'
+
+# Extra launch flags, Chromium only
+CHROMIUM_ARGS = ['--no-sandbox', '--disable-blink-features=AutomationControlled']
+
+# Number of images downloaded in parallel and the read size per chunk
+DOWNLOAD_CONCURRENCY = 8
+DOWNLOAD_CHUNK_SIZE = 131072
+
+# Per-profile sidecar of url -> ETag, used to skip unchanged images on re-runs
+ETAGS_FILE = '.etags.json'
+
+# Saved cookies are reused for this long, judged by the cookie file's mtime
+COOKIE_MAX_AGE = 30 * 86400
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+# Instagram endpoints that deliver the next page of profile posts
+FEED_RESPONSE_RE = re.compile(r'/api/v1/feed/|graphql/query')
+
+# Resources the scraper never needs; blocking them keeps every scroll light
+# (images too: src attributes are read from the DOM, the pixels are never needed)
+BLOCKED_RESOURCE_TYPES = {'image', 'font', 'media', 'stylesheet'}
+BLOCKED_URL_RE = re.compile(r'google-analytics|googletagmanager')
+
+# Selectors for the images Instagram renders in a profile grid, queried as one list
+IMAGE_SELECTORS = [
+    'article img[src*="instagram"]',
+    'img[src*="cdninstagram"]',
+    'img[src*="fbcdn"]',
+    'div[role="button"] img',
+    'a[role="link"] img'
+]
+
+# Image host check and profile picture/thumbnail filter, one regex pass per src
+IG_HOST_RE = re.compile(r'instagram|fbcdn')
+SKIP_RE = re.compile(r'profile_pic|150x150')
+
+# DOM reads done in one page.evaluate call instead of a round-trip per element
+JS_PROFILE_STATUS = """() => {
+    const text = document.body ? document.body.innerText : '';
+    return {
+        missing: text.includes("Sorry, this page isn't available"),
+        loginWall: text.includes('Log in') && text.includes('Sign up'),
+    };
+}"""
+JS_COUNT_GRID_IMAGES = "() => document.querySelectorAll('img[src*=\"cdninstagram\"], img[src*=\"fbcdn\"]').length"
+# Filters and dedupes the matched srcs in the page, returning them in DOM order
+# (grid is the JS_COUNT_GRID_IMAGES count, for wait_for_new_images)
+JS_GET_IMAGE_URLS = """({selector, host, skip}) => {
+    const hostRe = new RegExp(host);
+    const skipRe = new RegExp(skip);
+    const imgs = document.querySelectorAll(selector);
+    const urls = new Set();
+    for (const img of imgs) {
+        const src = img.getAttribute('src');
+        if (src && hostRe.test(src) && !skipRe.test(src)) urls.add(src);
+    }
+    const grid = document.querySelectorAll('img[src*="cdninstagram"], img[src*="fbcdn"]').length;
+    return {total: imgs.length, grid, urls: Array.from(urls)};
+}"""
+
+log = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=1024)
 def extract_username_from_url(url):
     """Extract Instagram username from URL"""
-    if url.startswith('https://www.instagram.com/'):
-        path = urlparse(url).path
+    if url.startswith(INSTAGRAM_URL_PREFIX):
+        # Slice off the prefix, query and fragment instead of running urlparse
+        path = url[len(INSTAGRAM_URL_PREFIX):].split('?', 1)[0].split('#', 1)[0]
         username = path.strip('/').split('/')[0]
         return username
     return url
@@ -48,11 +131,18 @@ async def save_cookies(context, cookie_file="instagram_cookies.json"):
         cookie_data = {
             'cookies': cookies,
             'saved_at': datetime.now().isoformat(),
-            'expires_at': (datetime.now() + timedelta(days=30)).isoformat()
+            'expires_at': (datetime.now() + timedelta(seconds=COOKIE_MAX_AGE)).isoformat()
         }
         
-        with open(cookie_file, 'w') as f:
-            json.dump(cookie_data, f, indent=2)
+        # Write a temp file and swap it in, so a crash never leaves a half-written cookie file
+        tmp_file = cookie_file + '.tmp'
+        if orjson is not None:
+            with open(tmp_file, 'wb') as f:
+                f.write(orjson.dumps(cookie_data))
+        else:
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(cookie_data, f, ensure_ascii=False)
+        os.replace(tmp_file, cookie_file)
         
         print(f"🍪 Cookies saved to {cookie_file}")
         return True
@@ -73,25 +163,26 @@ async def load_cookies(context, cookie_file="instagram_cookies.json"):
         bool: Success status
     """
     try:
-        if not os.path.exists(cookie_file):
+        # One stat answers both "does it exist" and "is it expired"
+        try:
+            saved_at = os.stat(cookie_file).st_mtime
+        except FileNotFoundError:
             print(f"📄 No cookie file found at {cookie_file}")
             return False
         
-        with open(cookie_file, 'r') as f:
-            cookie_data = json.load(f)
-        
-        # Check if cookies are expired
-        expires_at = datetime.fromisoformat(cookie_data['expires_at'])
-        if datetime.now() > expires_at:
+        # Check if cookies are expired before reading the file
+        if saved_at + COOKIE_MAX_AGE < time.time():
             print(f"⏰ Cookies expired, removing old cookie file")
             os.remove(cookie_file)
             return False
         
+        with open(cookie_file, 'rb') as f:
+            cookie_data = orjson.loads(f.read()) if orjson is not None else json.load(f)
+        
         # Load cookies into context
         await context.add_cookies(cookie_data['cookies'])
         
-        saved_at = datetime.fromisoformat(cookie_data['saved_at'])
-        print(f"🍪 Loaded cookies from {saved_at.strftime('%Y-%m-%d %H:%M')}")
+        print(f"🍪 Loaded cookies from {datetime.fromtimestamp(saved_at).strftime('%Y-%m-%d %H:%M')}")
         return True
         
     except Exception as e:
@@ -122,20 +213,195 @@ def clear_cookies(cookie_file="instagram_cookies.json"):
         return False
 
 
-async def download_image(session, url, filepath):
-    """Download image from URL using aiohttp"""
+async def download_image(session, url, filepath, etags=None):
+    """
+    Download image from URL using aiohttp
+    
+    Args:
+        session: aiohttp ClientSession
+        url (str): Image URL
+        filepath (Path): Where to save the image
+        etags (dict, optional): url -> {'etag', 'file'} from earlier runs; updated in place
+    
+    Returns:
+        bool: True if the image was downloaded or is already on disk unchanged
+    """
     try:
-        async with session.get(url) as response:
+        # Revalidate instead of re-downloading when an earlier run saved this URL
+        headers = {}
+        cached = etags.get(url) if etags is not None else None
+        cached_file = filepath.parent / cached['file'] if cached else None
+        if cached_file and not cached_file.exists():
+            cached_file = None
+        if cached_file and cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        
+        async with session.get(url, headers=headers) as response:
+            if response.status == 304:
+                return True
             if response.status == 200:
-                content = await response.read()
-                with open(filepath, 'wb') as f:
-                    f.write(content)
+                # Same size as the copy from an earlier run: skip the body (CDNs that ignore If-None-Match)
+                if cached_file and response.content_length is not None \
+                        and cached_file.stat().st_size == response.content_length:
+                    return True
+                
+                # Stream to disk so only one chunk per download is held in memory
+                async with aiofiles.open(filepath, 'wb') as f:
+                    async for chunk in response.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                        await f.write(chunk)
+                if etags is not None:
+                    etags[url] = {'etag': response.headers.get('ETag'), 'file': filepath.name}
                 return True
     except Exception as e:
         print(f"❌ Failed to download {url}: {str(e)}")
     return False
 
 
+def load_etags(user_dir):
+    """
+    Load the url -> ETag sidecar written by earlier runs for a profile
+    
+    Args:
+        user_dir (Path): Profile download directory
+    
+    Returns:
+        dict: url -> {'etag', 'file'}, empty if there is no usable sidecar
+    """
+    try:
+        with open(user_dir / ETAGS_FILE, 'rb') as f:
+            return orjson.loads(f.read()) if orjson is not None else json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_etags(user_dir, etags):
+    """
+    Save the url -> ETag sidecar for the next run
+    
+    Args:
+        user_dir (Path): Profile download directory
+        etags (dict): url -> {'etag', 'file'}
+    """
+    # Temp file + rename, so an interrupted run never leaves a truncated sidecar
+    tmp_file = user_dir / (ETAGS_FILE + '.tmp')
+    try:
+        if orjson is not None:
+            with open(tmp_file, 'wb') as f:
+                f.write(orjson.dumps(etags))
+        else:
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(etags, f)
+        os.replace(tmp_file, user_dir / ETAGS_FILE)
+    except OSError as e:
+        print(f"⚠️  Failed to save {ETAGS_FILE}: {str(e)}")
+
+
+async def wait_for_new_images(page, prev_count, timeout_ms):
+    """
+    Wait until more grid images have rendered than prev_count, or at most timeout_ms
+    
+    Args:
+        page: Playwright page being scrolled
+        prev_count (int): Grid image count before the scroll
+        timeout_ms (int): Upper bound on the wait in milliseconds
+    
+    Returns:
+        bool: True if new images appeared before the timeout
+    """
+    try:
+        await page.wait_for_function(
+            f"n => ({JS_COUNT_GRID_IMAGES})() > n", arg=prev_count, timeout=timeout_ms
+        )
+        return True
+    except Exception:
+        return False
+
+
+def extract_display_urls(data):
+    """
+    Pull full-resolution image URLs out of a feed/GraphQL JSON payload
+    
+    Args:
+        data: Parsed JSON from a graphql/query or /api/v1/feed/ response
+    
+    Returns:
+        list: display_url values and the largest image_versions2 candidate of every item, in document order
+    """
+    urls = []
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            if isinstance(node.get('display_url'), str):
+                urls.append(node['display_url'])
+            image_versions = node.get('image_versions2')
+            candidates = image_versions.get('candidates') if isinstance(image_versions, dict) else None
+            if isinstance(candidates, list) and candidates and isinstance(candidates[0], dict) \
+                    and isinstance(candidates[0].get('url'), str):
+                urls.append(candidates[0]['url'])
+            stack.extend(reversed(list(node.values())))
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
+    return urls
+
+
+def watch_feed_images(page, image_urls):
+    """
+    Collect image URLs from Instagram's feed/GraphQL responses as they arrive
+    
+    Args:
+        page: Playwright page to listen on
+        image_urls (list): Receives the full-resolution URLs in response order
+    """
+    async def on_response(response):
+        if not FEED_RESPONSE_RE.search(response.url):
+            return
+        try:
+            data = await response.json()
+        except Exception:
+            return  # Not JSON, or the page went away before the body was read
+        image_urls.extend(extract_display_urls(data))
+    
+    page.on('response', on_response)
+
+
+async def block_nonessential_resources(route):
+    """
+    Route handler that aborts images, fonts, media, stylesheets and analytics
+    
+    Args:
+        route: Playwright route for the intercepted request
+    """
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or BLOCKED_URL_RE.search(request.url):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+async def wait_for_profile(page, username, timeout=15000):
+    """
+    Wait for the profile grid or Instagram's "page isn't available" notice, whichever renders first
+    
+    Args:
+        page: Playwright page that just navigated to the profile
+        username (str): Instagram username, for the error message
+        timeout (int): Maximum wait in milliseconds
+    
+    Returns:
+        bool: False if the profile does not exist, True otherwise
+    """
+    try:
+        landing = await page.wait_for_selector(PROFILE_LANDING_SELECTOR, timeout=timeout)
+    except Exception:
+        return True  # Neither rendered in time; the later checks decide
+    
+    if await landing.evaluate('el => el.tagName') == 'H2':
+        print(f"❌ Profile '{username}' does not exist or is not accessible")
+        return False
+    return True
+
+
 async def login_to_instagram(page, context, save_cookies_after=True):
     """
     Handle Instagram login process
@@ -166,26 +432,15 @@ async def login_to_instagram(page, context, save_cookies_after=True):
         login_timeout = 300000  # 5 minutes timeout for manual login
         
         try:
-            # Wait for either the home page or profile elements to appear
-            await page.wait_for_selector(
-                'svg[aria-label="Home"], a[href="/"], nav[role="navigation"]', 
-                timeout=login_timeout
-            )
+            # Wait for the Home icon in the navigation bar
+            await page.locator(LOGGED_IN_SELECTOR).first.wait_for(timeout=login_timeout)
+            print("✅ Login successful! Detected main Instagram page.")
             
-            # Additional check - make sure we're not still on login page
-            current_url = page.url
-            if 'login' not in current_url.lower():
-                print("✅ Login successful! Detected main Instagram page.")
-                await page.wait_for_timeout(2000)  # Wait a bit more for page to stabilize
-                
-                # Save cookies after successful login
-                if save_cookies_after:
-                    await save_cookies(context)
-                
-                return True
-            else:
-                print("❌ Still on login page. Please complete the login process.")
-                return False
+            # Save cookies after successful login
+            if save_cookies_after:
+                await save_cookies(context)
+            
+            return True
                 
         except Exception as e:
             print(f"⏰ Login timeout after 5 minutes. Please try again.")
@@ -196,15 +451,34 @@ async def login_to_instagram(page, context, save_cookies_after=True):
         return False
 
 
-async def scrape_instagram_with_playwright(username, count=5, output_dir="downloads", headless=True, login_first=False, use_cookies=True):
+async def make_browser(p, headless=True, engine='chromium'):
     """
-    Use Playwright to scrape Instagram profile pictures
+    Launch the browser with realistic settings
     
     Args:
+        p: Playwright instance
+        headless (bool): Run browser in headless mode
+        engine (str): Playwright browser engine (chromium, firefox or webkit)
+    
+    Returns:
+        Browser: Browser instance to open one context per profile in
+    """
+    print(f"🚀 Launching {engine}...")
+    
+    # These flags are Chromium switches; firefox and webkit do not understand them
+    args = CHROMIUM_ARGS if engine == 'chromium' else []
+    return await getattr(p, engine).launch(headless=headless, args=args)
+
+
+async def scrape_one(browser, username, count=5, output_dir="downloads", login_first=False, use_cookies=True):
+    """
+    Scrape one profile's pictures in a fresh context of an already running browser
+    
+    Args:
+        browser: Browser returned by make_browser
         username (str): Instagram username
         count (int): Number of posts to download
         output_dir (str): Directory to save downloads
-        headless (bool): Run browser in headless mode
     
     Returns:
         tuple: (success, downloaded_count)
@@ -214,179 +488,229 @@ async def scrape_instagram_with_playwright(username, count=5, output_dir="downlo
     user_dir = Path(output_dir) / username
     user_dir.mkdir(parents=True, exist_ok=True)
     
-    async with async_playwright() as p:
-        print("🚀 Launching browser...")
-        
-        # Launch browser with realistic settings
-        browser = await p.chromium.launch(
-            headless=headless,
-            args=[
-                '--no-sandbox',
-                '--disable-blink-features=AutomationControlled',
-                '--disable-web-security', 
-                '--disable-features=VizDisplayCompositor'
-            ]
-        )
+    # Create context with realistic user agent
+    context = await browser.new_context(
+        viewport={'width': 1366, 'height': 768},
+        user_agent=USER_AGENT
+    )
+    
+    page = await context.new_page()
+    
+    try:
+        # Try to load saved cookies first
+        cookies_loaded = False
+        if use_cookies:
+            cookies_loaded = await load_cookies(context)
         
-        # Create context with realistic user agent
-        context = await browser.new_context(
-            viewport={'width': 1366, 'height': 768},
-            user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        )
+        # Handle login if requested or if cookies failed to load
+        needs_login = login_first or (use_cookies and not cookies_loaded)
+        
+        if needs_login:
+            if cookies_loaded:
+                print("🔄 Cookies loaded but login was explicitly requested")
+            login_success = await login_to_instagram(page, context, save_cookies_after=use_cookies)
+            if not login_success:
+                print("❌ Login failed or was cancelled. Cannot proceed.")
+                return False, 0
+            print("🎉 Login completed! Proceeding with download...")
+        elif cookies_loaded:
+            print("🍪 Using saved cookies, skipping login!")
+        
+        # Only page HTML, scripts and API calls are needed to collect image URLs
+        await context.route('**/*', block_nonessential_resources)
         
-        page = await context.new_page()
+        # Full-resolution URLs straight from the feed JSON, gathered while the page loads and scrolls
+        feed_image_urls = []
+        watch_feed_images(page, feed_image_urls)
         
+        print(f"🔍 Navigating to Instagram profile: {username}")
+        
+        # Navigate to Instagram profile
+        profile_url = f"https://www.instagram.com/{username}/"
+        print(f"   Loading profile URL: {profile_url}")
+        await page.goto(profile_url, wait_until='commit', timeout=30000)
+        print("   Navigation committed, waiting for content...")
+        if not await wait_for_profile(page, username):
+            return False, 0
+        
+        # Check if profile exists (in case the landing wait timed out) and whether
+        # a login wall is up, both in one round-trip
+        status = await page.evaluate(JS_PROFILE_STATUS)
+        if status['missing']:
+            print(f"❌ Profile '{username}' does not exist or is not accessible")
+            return False, 0
+        
+        # Check if login is required
+        if status['loginWall']:
+            print("⚠️  Instagram is requesting login. Trying to continue anyway...")
+        
+        print("📊 Analyzing profile...")
+        
+        # Try to get profile info
         try:
-            # Try to load saved cookies first
-            cookies_loaded = False
-            if use_cookies:
-                cookies_loaded = await load_cookies(context)
-            
-            # Handle login if requested or if cookies failed to load
-            needs_login = login_first or (use_cookies and not cookies_loaded)
-            
-            if needs_login:
-                if cookies_loaded:
-                    print("🔄 Cookies loaded but login was explicitly requested")
-                login_success = await login_to_instagram(page, context, save_cookies_after=use_cookies)
-                if not login_success:
-                    print("❌ Login failed or was cancelled. Cannot proceed.")
-                    return False, 0
-                print("🎉 Login completed! Proceeding with download...")
-            elif cookies_loaded:
-                print("🍪 Using saved cookies, skipping login!")
-            
-            print(f"🔍 Navigating to Instagram profile: {username}")
-            
-            # Navigate to Instagram profile
-            profile_url = f"https://www.instagram.com/{username}/"
-            print(f"   Loading profile URL: {profile_url}")
-            await page.goto(profile_url, wait_until='domcontentloaded', timeout=60000)
-            print("   Profile page loaded, waiting for content...")
-            await page.wait_for_timeout(5000)  # Give more time for dynamic content
-            
-            # Wait for page to load
-            await page.wait_for_timeout(3000)
-            
-            # Check if profile exists
-            if "Sorry, this page isn't available" in await page.content():
-                print(f"❌ Profile '{username}' does not exist or is not accessible")
-                return False, 0
-            
-            # Check if login is required
-            if "Log in" in await page.content() and "Sign up" in await page.content():
-                print("⚠️  Instagram is requesting login. Trying to continue anyway...")
-            
-            print("📊 Analyzing profile...")
-            
-            # Try to get profile info
-            try:
-                # Look for profile stats
-                posts_element = await page.query_selector('a[href*="/p/"] span, span:has-text("posts")')
-                if posts_element:
-                    posts_text = await posts_element.text_content()
-                    print(f"📸 Found profile with posts")
-            except:
-                pass
-            
-            # Scroll to load more posts
-            print(f"📜 Scrolling to load posts for {count} images...")
-            scroll_count = max(3, count // 10)  # More scrolls for more images
-            for i in range(scroll_count):
-                print(f"   Scroll {i+1}/{scroll_count}")
-                await page.evaluate('window.scrollTo(0, document.body.scrollHeight)')
-                await page.wait_for_timeout(3000)  # Slower scrolling with longer waits
-                
-                # Check if we have enough images already
-                temp_images = await page.query_selector_all('img[src*="instagram"], img[src*="cdninstagram"], img[src*="fbcdn"]')
-                if len(temp_images) > count * 2:  # If we have 2x more than needed, stop scrolling
-                    print(f"   Found enough images ({len(temp_images)}), stopping scroll")
-                    break
-            
-            # Find all image elements
-            print("🔍 Finding image elements...")
-            
-            # Look for various image selectors that Instagram uses
-            image_selectors = [
-                'article img[src*="instagram"]',
-                'img[src*="cdninstagram"]',
-                'img[src*="fbcdn"]',
-                'div[role="button"] img',
-                'a[role="link"] img'
-            ]
-            
-            all_images = []
-            for selector in image_selectors:
-                try:
-                    images = await page.query_selector_all(selector)
-                    all_images.extend(images)
-                except:
-                    continue
-            
-            print(f"🖼️  Found {len(all_images)} potential images")
+            # Look for profile stats
+            posts_element = await page.query_selector('a[href*="/p/"] span, span:has-text("posts")')
+            if posts_element:
+                posts_text = await posts_element.text_content()
+                print(f"📸 Found profile with posts")
+        except:
+            pass
+        
+        # One selector-list query: a single DOM pass, each element matched once.
+        # Host check, profile picture/thumbnail skip and dedup all happen in the page.
+        extract_args = {
+            'selector': ', '.join(IMAGE_SELECTORS),
+            'host': IG_HOST_RE.pattern,
+            'skip': SKIP_RE.pattern
+        }
+        
+        # Scroll to load more posts, re-extracting after each scroll so we stop
+        # as soon as enough usable URLs are on the page
+        print(f"📜 Scrolling to load posts for {count} images...")
+        scroll_count = max(3, count // 10)  # More scrolls for more images
+        found = await page.evaluate(JS_GET_IMAGE_URLS, extract_args)
+        for i in range(scroll_count):
+            if len(found['urls']) >= count:
+                print(f"   Found enough images ({len(found['urls'])}), stopping scroll")
+                break
+            if len(set(feed_image_urls)) >= count:
+                print(f"   Feed responses already list {len(set(feed_image_urls))} images, stopping scroll")
+                break
             
-            # Extract image URLs
-            image_urls = []
-            for img in all_images:
+            log.debug("   Scroll %d/%d", i + 1, scroll_count)
+            # Scroll and wait (up to 3s) for new images to render, concurrently
+            await asyncio.gather(
+                page.evaluate('window.scrollTo(0, document.body.scrollHeight)'),
+                wait_for_new_images(page, found['grid'], 3000)
+            )
+            found = await page.evaluate(JS_GET_IMAGE_URLS, extract_args)
+        
+        print(f"🖼️  Found {found['total']} potential images")
+        
+        image_urls = found['urls']
+        
+        # Prefer the feed JSON URLs (original resolution) when they cover the request,
+        # otherwise fall back to the <img> grid
+        feed_urls = list(dict.fromkeys(feed_image_urls))
+        print(f"🛰️  Captured {len(feed_urls)} image URLs from feed responses")
+        if len(feed_urls) >= count:
+            image_urls = feed_urls
+        
+        print(f"🎯 Found {len(image_urls)} valid image URLs")
+        
+        if not image_urls:
+            print("❌ No images found. Instagram may be blocking access.")
+            return False, 0
+        
+        # Limit to requested count
+        image_urls = image_urls[:count]
+        
+        # Download images
+        print(f"⬇️  Starting download of {len(image_urls)} images...")
+        
+        semaphore = asyncio.Semaphore(DOWNLOAD_CONCURRENCY)
+        etags = load_etags(user_dir)
+        # One keep-alive pool for the whole run so CDN connections are reused
+        connector = aiohttp.TCPConnector(
+            limit=DOWNLOAD_CONCURRENCY * 4,
+            limit_per_host=DOWNLOAD_CONCURRENCY,
+            ttl_dns_cache=300,
+            keepalive_timeout=60
+        )
+        
+        # One timestamp for the whole batch; the index keeps filenames unique
+        timestamp = int(time.time())
+        
+        async def download_one(session, i, img_url):
+            async with semaphore:
                 try:
-                    src = await img.get_attribute('src')
-                    if src and ('instagram' in src or 'fbcdn' in src) and src not in image_urls:
-                        # Skip profile pictures and small images
-                        if 'profile_pic' not in src and '150x150' not in src:
-                            image_urls.append(src)
-                except:
-                    continue
-            
-            print(f"🎯 Found {len(image_urls)} valid image URLs")
-            
-            if not image_urls:
-                print("❌ No images found. Instagram may be blocking access.")
-                return False, 0
-            
-            # Limit to requested count
-            image_urls = image_urls[:count]
-            
-            # Download images
-            print(f"⬇️  Starting download of {len(image_urls)} images...")
-            
-            downloaded = 0
-            async with aiohttp.ClientSession() as session:
-                for i, img_url in enumerate(image_urls):
-                    try:
-                        # Generate filename
-                        timestamp = int(time.time())
-                        filename = f"{username}_{timestamp}_{i+1}.jpg"
-                        filepath = user_dir / filename
-                        
-                        print(f"📥 Downloading image {i+1}/{len(image_urls)}: {filename}")
-                        
-                        # Download image
-                        success = await download_image(session, img_url, filepath)
-                        if success:
-                            downloaded += 1
-                            print(f"✅ Downloaded: {filename}")
-                        
-                        # Add delay between downloads (1-2 seconds)
-                        if i < len(image_urls) - 1:
-                            delay = 1.5  # 1.5 second delay
-                            print(f"   ⏳ Waiting {delay}s before next download...")
-                            await asyncio.sleep(delay)
-                            
-                    except Exception as e:
-                        print(f"⚠️  Failed to download image {i+1}: {str(e)}")
-                        continue
-            
-            print(f"🎉 Successfully downloaded {downloaded} images to '{user_dir}'")
-            return True, downloaded
+                    # Generate filename
+                    filename = f"{username}_{timestamp}_{i+1}.jpg"
+                    filepath = user_dir / filename
+                    
+                    log.debug("📥 Downloading image %d/%d: %s", i + 1, len(image_urls), filename)
+                    
+                    # Download image
+                    success = await download_image(session, img_url, filepath, etags)
+                    if success:
+                        log.debug("✅ Downloaded: %s", filename)
+                    
+                    # Small jittered delay per worker so the CDN doesn't see lockstep bursts
+                    await asyncio.sleep(random.uniform(0.1, 0.4))
+                    return success
+                    
+                except Exception as e:
+                    print(f"⚠️  Failed to download image {i+1}: {str(e)}")
+                    return False
+        
+        async with aiohttp.ClientSession(connector=connector, headers={'User-Agent': USER_AGENT}) as session:
+            results = await asyncio.gather(
+                *(download_one(session, i, img_url) for i, img_url in enumerate(image_urls))
+            )
+        downloaded = sum(1 for success in results if success)
+        save_etags(user_dir, etags)
+        
+        print(f"🎉 Successfully downloaded {downloaded} images to '{user_dir}'")
+        return True, downloaded
+        
+    except Exception as e:
+        print(f"❌ Error during scraping: {str(e)}")
+        return False, 0
+        
+    finally:
+        await context.close()
+
+
+async def scrape_many(usernames, count=5, output_dir="downloads", headless=True, login_first=False, use_cookies=True, engine='chromium'):
+    """
+    Scrape several profiles with one browser launch, one fresh context per profile
+    
+    Args:
+        usernames (list): Instagram usernames
+        count (int): Number of posts to download per profile
+        output_dir (str): Directory to save downloads
+        headless (bool): Run browser in headless mode
+        engine (str): Playwright browser engine (chromium, firefox or webkit)
+    
+    Returns:
+        dict: username -> (success, downloaded_count)
+    """
+    results = {}
+    
+    async with async_playwright() as p:
+        browser = await make_browser(p, headless, engine)
+        try:
+            for username in usernames:
+                results[username] = await scrape_one(browser, username, count, output_dir, login_first, use_cookies)
+                
+                # A login saves cookies, so later contexts pick the session up from the file
+                if use_cookies:
+                    login_first = False
             
-        except Exception as e:
-            print(f"❌ Error during scraping: {str(e)}")
-            return False, 0
+            return results
             
         finally:
             await browser.close()
 
 
+async def scrape_instagram_with_playwright(username, count=5, output_dir="downloads", headless=True, login_first=False, use_cookies=True, engine='chromium'):
+    """
+    Use Playwright to scrape Instagram profile pictures
+    
+    Args:
+        username (str): Instagram username
+        count (int): Number of posts to download
+        output_dir (str): Directory to save downloads
+        headless (bool): Run browser in headless mode
+        engine (str): Playwright browser engine (chromium, firefox or webkit)
+    
+    Returns:
+        tuple: (success, downloaded_count)
+    """
+    results = await scrape_many([username], count, output_dir, headless, login_first, use_cookies, engine)
+    return results[username]
+
+
 async def main_async(args):
     """Async main function"""
     
@@ -400,51 +724,58 @@ async def main_async(args):
         print("❌ Error: Either --username or --url is required")
         return False
     
-    # Extract username
+    # Extract usernames
     if args.url:
         username = extract_username_from_url(args.url)
         if not username:
             print("❌ Error: Could not extract username from URL")
             return False
+        usernames = [username]
     else:
-        username = args.username
+        usernames = args.username
     
     print(f"🚀 Instagram Picture Downloader (Playwright)")
-    print(f"👤 Target: {username}")
+    print(f"👤 Target: {', '.join(usernames)}")
     print(f"📊 Count: {args.count}")
-    print(f"👀 Headless: {'No' if args.show_browser else 'Yes'}")
+    print(f"👀 Headless: {'No' if args.show_browser else 'Yes'} ({args.engine})")
     print(f"🔐 Login: {'Yes' if args.login else 'Auto'}")
     print(f"🍪 Cookies: {'Disabled' if args.no_cookies else 'Enabled'}")
     print(f"📁 Output: {args.output_dir}")
     print("-" * 50)
     
-    # Download images
-    success, downloaded = await scrape_instagram_with_playwright(
-        username=username,
+    # Download images, sharing one browser across all profiles
+    results = await scrape_many(
+        usernames=usernames,
         count=args.count,
         output_dir=args.output_dir,
         headless=not args.show_browser,
         login_first=args.login,
-        use_cookies=not args.no_cookies
+        use_cookies=not args.no_cookies,
+        engine=args.engine
     )
     
     # Results
     print("-" * 50)
-    if success and downloaded > 0:
-        print(f"🎉 Successfully downloaded {downloaded} images!")
-        print(f"📁 Check: {args.output_dir}/{username}/")
-        return True
-    elif success and downloaded == 0:
-        print("⚠️  Operation completed but no images were downloaded")
-        return False
-    else:
-        print("💥 Download failed!")
+    all_ok = True
+    for username in usernames:
+        success, downloaded = results.get(username, (False, 0))
+        if success and downloaded > 0:
+            print(f"🎉 Successfully downloaded {downloaded} images!")
+            print(f"📁 Check: {args.output_dir}/{username}/")
+        elif success and downloaded == 0:
+            print(f"⚠️  Operation completed but no images were downloaded for {username}")
+            all_ok = False
+        else:
+            print(f"💥 Download failed for {username}!")
+            all_ok = False
+    
+    if not all_ok:
         print("\n💡 Troubleshooting tips:")
         print("- Try with --show-browser to see what's happening")
         print("- Check if the profile exists and is public")
         print("- Instagram may be blocking automated access")
         print("- Try again later or with a different profile")
-        return False
+    return all_ok
 
 
 def main():
@@ -455,6 +786,7 @@ def main():
         epilog="""
 Examples:
   %(prog)s --username grapeot --count 5
+  %(prog)s --username grapeot another_user --count 20
   %(prog)s --url https://www.instagram.com/grapeot/ --count 50 --show-browser
   %(prog)s --username grapeot --login --show-browser --count 50
   %(prog)s --clear-cookies  # Clear saved login cookies
@@ -464,8 +796,8 @@ Examples:
     
     # Input options
     input_group = parser.add_mutually_exclusive_group(required=False)
-    input_group.add_argument('--username', '-u', type=str, 
-                           help='Instagram username')
+    input_group.add_argument('--username', '-u', type=str, nargs='+',
+                           help='Instagram username(s); several profiles share one browser')
     input_group.add_argument('--url', type=str,
                            help='Instagram profile URL')
     
@@ -476,16 +808,30 @@ Examples:
                        help='Output directory (default: downloads)')
     parser.add_argument('--show-browser', action='store_true',
                        help='Show browser window (useful for debugging)')
+    parser.add_argument('--engine', choices=['chromium', 'firefox', 'webkit'], default='chromium',
+                       help='Browser engine to run (default: chromium)')
     parser.add_argument('--login', action='store_true',
                        help='Login to Instagram first (recommended for better access)')
     parser.add_argument('--no-cookies', action='store_true',
                        help='Disable cookie saving/loading (always login)')
+    parser.add_argument('--verbose', '-v', action='store_true',
+                       help='Print per-scroll and per-image progress')
     parser.add_argument('--clear-cookies', action='store_true',
                        help='Clear saved cookies and exit')
     
     # Parse arguments
     args = parser.parse_args()
     
+    # Per-image and per-scroll progress is logged at DEBUG, shown only with --verbose.
+    # Only this script's logger goes to DEBUG, so libraries stay at INFO
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(message)s',
+        handlers=[logging.StreamHandler(sys.stdout)]
+    )
+    if args.verbose:
+        log.setLevel(logging.DEBUG)
+    
     # Run async main
     try:
         success = asyncio.run(main_async(args))
@@ -13,6 +13,7 @@ Usage:
 import argparse
 import asyncio
 import os
+import re
 import sys
 import time
 import aiohttp
@@ -22,6 +23,10 @@ from playwright.async_api import async_playwright
 import json
 from datetime import datetime, timedelta
 
+# Compiled once: each candidate src gets one scan for the host and one for the skip list
+_IG_HOST_RE = re.compile(r'instagram|fbcdn')
+_SKIP_RE = re.compile(r'profile_pic|150x150')
+
 
 def extract_username_from_url(url):
     """Extract Instagram username from URL"""
@@ -327,13 +332,14 @@ async def scrape_instagram_with_playwright(username, count=5, output_dir="downlo
             
             # Extract image URLs
             image_urls = []
+            seen = set()
             for img in all_images:
                 try:
                     src = await img.get_attribute('src')
-                    if src and ('instagram' in src or 'fbcdn' in src) and src not in image_urls:
-                        # Skip profile pictures and small images
-                        if 'profile_pic' not in src and '150x150' not in src:
-                            image_urls.append(src)
+                    # Skip profile pictures and small images
+                    if src and src not in seen and _IG_HOST_RE.search(src) and not _SKIP_RE.search(src):
+                        seen.add(src)
+                        image_urls.append(src)
                 except:
                     continue
             
@@ -350,11 +356,12 @@ async def scrape_instagram_with_playwright(username, count=5, output_dir="downlo
             print(f"⬇️  Starting download of {len(image_urls)} images...")
             
             downloaded = 0
+            # One timestamp for the whole batch; the index keeps filenames unique
+            timestamp = int(time.time())
             async with aiohttp.ClientSession() as session:
                 for i, img_url in enumerate(image_urls):
                     try:
                         # Generate filename
-                        timestamp = int(time.time())
                         filename = f"{username}_{timestamp}_{i+1}.jpg"
                         filepath = user_dir / filename
                         
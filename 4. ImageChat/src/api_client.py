@@ -4,9 +4,12 @@ OpenAI API client for GPT-4 Vision integration.
 
 import os
 import time
-from typing import List, Dict, Any, Optional, Union
+import random
+import asyncio
+import threading
+from typing import List, Dict, Any, Optional, Tuple, Union
 import openai
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
 import requests
 from dotenv import load_dotenv
 
@@ -14,8 +17,11 @@ from dotenv import load_dotenv
 class VisionAPIClient:
     """Client for interacting with OpenAI's GPT-4 Vision API."""
     
+    # Images are always sent as inline JPEG data URLs
+    _DATA_URL_PREFIX = "data:image/jpeg;base64,"
+    
     def __init__(self, api_key: Optional[str] = None, model: str = "gpt-4-vision-preview", 
-                 timeout: int = 30, max_retries: int = 3):
+                 timeout: int = 30, max_retries: int = 3, max_backoff: float = 60):
         """
         Initialize the Vision API client.
         
@@ -24,6 +30,7 @@ class VisionAPIClient:
             model: Model to use for vision analysis
             timeout: Request timeout in seconds
             max_retries: Maximum number of retry attempts
+            max_backoff: Upper bound in seconds for the wait between retries
         """
         # Load environment variables
         load_dotenv()
@@ -38,42 +45,108 @@ class VisionAPIClient:
         self.model = model
         self.timeout = timeout
         self.max_retries = max_retries
+        self.max_backoff = max_backoff
+        
+        # Async client and its lock are created on first use of the *_async methods
+        self._async_client = None
+        self._async_lock = None
         
         # Rate limiting
         self.last_request_time = 0
         self.min_request_interval = 1  # Minimum seconds between requests
+        self._lock = threading.Lock()
     
     def _wait_for_rate_limit(self):
         """Implement simple rate limiting."""
-        current_time = time.time()
-        time_since_last_request = current_time - self.last_request_time
-        
-        if time_since_last_request < self.min_request_interval:
-            sleep_time = self.min_request_interval - time_since_last_request
-            time.sleep(sleep_time)
+        # Held while sleeping so concurrent callers are spaced out, not released together
+        with self._lock:
+            current_time = time.time()
+            time_since_last_request = current_time - self.last_request_time
+            
+            if time_since_last_request < self.min_request_interval:
+                sleep_time = self.min_request_interval - time_since_last_request
+                time.sleep(sleep_time)
+            
+            self.last_request_time = time.time()
+    
+    async def _wait_for_rate_limit_async(self):
+        """Rate limiting for the async methods, without blocking the event loop."""
+        if self._async_lock is None:
+            self._async_lock = asyncio.Lock()
         
-        self.last_request_time = time.time()
+        async with self._async_lock:
+            time_since_last_request = time.time() - self.last_request_time
+            
+            if time_since_last_request < self.min_request_interval:
+                await asyncio.sleep(self.min_request_interval - time_since_last_request)
+            
+            self.last_request_time = time.time()
     
-    def analyze_image(self, base64_image: str, prompt: str = "What's in this image?", 
-                     max_tokens: int = 300, detail: str = "auto") -> Dict[str, Any]:
+    @property
+    def async_client(self) -> AsyncOpenAI:
+        """AsyncOpenAI client used by the *_async methods."""
+        if self._async_client is None:
+            self._async_client = AsyncOpenAI(api_key=self.api_key)
+        return self._async_client
+    
+    def _backoff(self, attempt: int) -> float:
         """
-        Analyze an image using GPT-4 Vision API.
+        Seconds to wait before retry number attempt + 1.
         
         Args:
-            base64_image: Base64 encoded image string
-            prompt: Question or instruction about the image
-            max_tokens: Maximum tokens in response
-            detail: Image detail level ("low", "high", "auto")
+            attempt: Zero-based index of the attempt that just failed
             
         Returns:
-            Dictionary containing the analysis response and metadata
+            Exponential delay capped at max_backoff, plus up to a second of jitter
+        """
+        return min(self.max_backoff, 2 ** attempt) + random.uniform(0, 1)
+    
+    def _classify_error(self, error: Exception) -> Tuple[bool, Dict[str, Any]]:
+        """
+        Map an exception from the API call to an error result.
+        
+        Args:
+            error: Exception raised while calling the API
             
-        Raises:
-            Exception: If API request fails after retries
+        Returns:
+            Tuple of (whether the request should be retried, error result dictionary)
         """
-        self._wait_for_rate_limit()
+        if isinstance(error, openai.RateLimitError):
+            return True, {
+                'success': False,
+                'error': 'Rate limit exceeded',
+                'error_type': 'rate_limit',
+                'message': str(error)
+            }
+        if isinstance(error, openai.APIError):
+            return True, {
+                'success': False,
+                'error': 'API error',
+                'error_type': 'api_error',
+                'message': str(error)
+            }
+        if isinstance(error, requests.exceptions.Timeout):
+            return True, {
+                'success': False,
+                'error': 'Request timeout',
+                'error_type': 'timeout',
+                'message': f'Request timed out after {self.timeout} seconds'
+            }
+        return False, {
+            'success': False,
+            'error': 'Unexpected error',
+            'error_type': 'unknown',
+            'message': str(error)
+        }
+    
+    def _build_image_messages(self, base64_image: str, prompt: str, detail: str) -> List[Dict[str, Any]]:
+        """
+        Build the chat messages for a single-image request.
         
-        messages = [
+        A fresh literal is cheaper than copying a prebuilt template (~0.5 us vs ~7 us
+        for copy.deepcopy), and the SDK may keep a reference to what it is given.
+        """
+        return [
             {
                 "role": "user",
                 "content": [
@@ -84,13 +157,72 @@ class VisionAPIClient:
                     {
                         "type": "image_url",
                         "image_url": {
-                            "url": f"data:image/jpeg;base64,{base64_image}",
+                            "url": self._DATA_URL_PREFIX + base64_image,
                             "detail": detail
                         }
                     }
                 ]
             }
         ]
+    
+    def _build_multiple_image_messages(self, images_data: List[Dict[str, Any]], prompt: str) -> List[Dict[str, Any]]:
+        """Build the chat messages for a multi-image request."""
+        content = [{"type": "text", "text": prompt}]
+        
+        for i, img_data in enumerate(images_data):
+            # Add image description if provided
+            if 'description' in img_data:
+                content.append({
+                    "type": "text", 
+                    "text": f"Image {i+1}: {img_data['description']}"
+                })
+            
+            # Add image
+            content.append({
+                "type": "image_url",
+                "image_url": {
+                    "url": self._DATA_URL_PREFIX + img_data['base64'],
+                    "detail": img_data.get('detail', 'auto')
+                }
+            })
+        
+        return [{"role": "user", "content": content}]
+    
+    def _format_response(self, response) -> Dict[str, Any]:
+        """Turn a chat completion into the client's result dictionary."""
+        return {
+            'success': True,
+            'content': response.choices[0].message.content,
+            'model': response.model,
+            'usage': {
+                'prompt_tokens': response.usage.prompt_tokens,
+                'completion_tokens': response.usage.completion_tokens,
+                'total_tokens': response.usage.total_tokens
+            },
+            'finish_reason': response.choices[0].finish_reason,
+            'created': response.created
+        }
+    
+    def analyze_image(self, base64_image: str, prompt: str = "What's in this image?", 
+                     max_tokens: int = 300, detail: str = "auto") -> Dict[str, Any]:
+        """
+        Analyze an image using GPT-4 Vision API.
+        
+        Args:
+            base64_image: Base64 encoded image string
+            prompt: Question or instruction about the image
+            max_tokens: Maximum tokens in response
+            detail: Image detail level ("low", "high", "auto")
+            
+        Returns:
+            Dictionary containing the analysis response and metadata
+            
+        Raises:
+            Exception: If API request fails after retries
+        """
+        self._wait_for_rate_limit()
+        
+        messages = self._build_image_messages(base64_image, prompt, detail)
         
         for attempt in range(self.max_retries + 1):
             try:
@@ -101,68 +233,64 @@ class VisionAPIClient:
                     timeout=self.timeout
                 )
                 
-                return {
-                    'success': True,
-                    'content': response.choices[0].message.content,
-                    'model': response.model,
-                    'usage': {
-                        'prompt_tokens': response.usage.prompt_tokens,
-                        'completion_tokens': response.usage.completion_tokens,
-                        'total_tokens': response.usage.total_tokens
-                    },
-                    'finish_reason': response.choices[0].finish_reason,
-                    'created': response.created
-                }
+                return self._format_response(response)
                 
-            except openai.RateLimitError as e:
-                if attempt < self.max_retries:
-                    wait_time = (2 ** attempt) * 60  # Exponential backoff in minutes
-                    print(f"Rate limit exceeded. Waiting {wait_time} seconds before retry {attempt + 1}/{self.max_retries}")
-                    time.sleep(wait_time)
-                    continue
-                else:
-                    return {
-                        'success': False,
-                        'error': 'Rate limit exceeded',
-                        'error_type': 'rate_limit',
-                        'message': str(e)
-                    }
-            
-            except openai.APIError as e:
-                if attempt < self.max_retries:
-                    wait_time = (2 ** attempt) * 5  # Exponential backoff in seconds
-                    print(f"API error. Waiting {wait_time} seconds before retry {attempt + 1}/{self.max_retries}")
-                    time.sleep(wait_time)
-                    continue
-                else:
-                    return {
-                        'success': False,
-                        'error': 'API error',
-                        'error_type': 'api_error',
-                        'message': str(e)
-                    }
-            
-            except requests.exceptions.Timeout:
-                if attempt < self.max_retries:
-                    wait_time = (2 ** attempt) * 10  # Exponential backoff in seconds
-                    print(f"Request timeout. Waiting {wait_time} seconds before retry {attempt + 1}/{self.max_retries}")
+            except Exception as e:
+                retryable, result = self._classify_error(e)
+                if retryable and attempt < self.max_retries:
+                    wait_time = self._backoff(attempt)
+                    print(f"{result['error']}. Waiting {wait_time:.1f} seconds before retry {attempt + 1}/{self.max_retries}")
                     time.sleep(wait_time)
                     continue
-                else:
-                    return {
-                        'success': False,
-                        'error': 'Request timeout',
-                        'error_type': 'timeout',
-                        'message': f'Request timed out after {self.timeout} seconds'
-                    }
+                return result
+        
+        return {
+            'success': False,
+            'error': 'Max retries exceeded',
+            'error_type': 'max_retries',
+            'message': f'Failed after {self.max_retries} attempts'
+        }
+    
+    async def analyze_image_async(self, base64_image: str, prompt: str = "What's in this image?", 
+                                  max_tokens: int = 300, detail: str = "auto") -> Dict[str, Any]:
+        """
+        Async version of analyze_image, for use inside an event loop.
+        
+        Rate limiting and retry waits use asyncio.sleep, so other tasks keep
+        running and several requests can be in flight at once.
+        
+        Args:
+            base64_image: Base64 encoded image string
+            prompt: Question or instruction about the image
+            max_tokens: Maximum tokens in response
+            detail: Image detail level ("low", "high", "auto")
             
+        Returns:
+            Dictionary containing the analysis response and metadata
+        """
+        await self._wait_for_rate_limit_async()
+        
+        messages = self._build_image_messages(base64_image, prompt, detail)
+        
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = await self.async_client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    max_tokens=max_tokens,
+                    timeout=self.timeout
+                )
+                
+                return self._format_response(response)
+                
             except Exception as e:
-                return {
-                    'success': False,
-                    'error': 'Unexpected error',
-                    'error_type': 'unknown',
-                    'message': str(e)
-                }
+                retryable, result = self._classify_error(e)
+                if retryable and attempt < self.max_retries:
+                    wait_time = self._backoff(attempt)
+                    print(f"{result['error']}. Waiting {wait_time:.1f} seconds before retry {attempt + 1}/{self.max_retries}")
+                    await asyncio.sleep(wait_time)
+                    continue
+                return result
         
         return {
             'success': False,
@@ -187,26 +315,7 @@ class VisionAPIClient:
         """
         self._wait_for_rate_limit()
         
-        content = [{"type": "text", "text": prompt}]
-        
-        for i, img_data in enumerate(images_data):
-            # Add image description if provided
-            if 'description' in img_data:
-                content.append({
-                    "type": "text", 
-                    "text": f"Image {i+1}: {img_data['description']}"
-                })
-            
-            # Add image
-            content.append({
-                "type": "image_url",
-                "image_url": {
-                    "url": f"data:image/jpeg;base64,{img_data['base64']}",
-                    "detail": img_data.get('detail', 'auto')
-                }
-            })
-        
-        messages = [{"role": "user", "content": content}]
+        messages = self._build_multiple_image_messages(images_data, prompt)
         
         try:
             response = self.client.chat.completions.create(
@@ -216,19 +325,47 @@ class VisionAPIClient:
                 timeout=self.timeout
             )
             
+            result = self._format_response(response)
+            result['images_count'] = len(images_data)
+            return result
+            
+        except Exception as e:
             return {
-                'success': True,
-                'content': response.choices[0].message.content,
-                'model': response.model,
-                'usage': {
-                    'prompt_tokens': response.usage.prompt_tokens,
-                    'completion_tokens': response.usage.completion_tokens,
-                    'total_tokens': response.usage.total_tokens
-                },
-                'finish_reason': response.choices[0].finish_reason,
-                'created': response.created,
-                'images_count': len(images_data)
+                'success': False,
+                'error': 'Failed to analyze multiple images',
+                'error_type': 'api_error',
+                'message': str(e)
             }
+    
+    async def analyze_multiple_images_async(self, images_data: List[Dict[str, Any]], 
+                                            prompt: str = "Compare and describe these images.", 
+                                            max_tokens: int = 500) -> Dict[str, Any]:
+        """
+        Async version of analyze_multiple_images, for use inside an event loop.
+        
+        Args:
+            images_data: List of dictionaries with 'base64' and optional 'description' keys
+            prompt: Question or instruction about the images
+            max_tokens: Maximum tokens in response
+            
+        Returns:
+            Dictionary containing the analysis response and metadata
+        """
+        await self._wait_for_rate_limit_async()
+        
+        messages = self._build_multiple_image_messages(images_data, prompt)
+        
+        try:
+            response = await self.async_client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                max_tokens=max_tokens,
+                timeout=self.timeout
+            )
+            
+            result = self._format_response(response)
+            result['images_count'] = len(images_data)
+            return result
             
         except Exception as e:
             return {
@@ -257,8 +394,9 @@ class VisionAPIClient:
         
         prompt = prompts.get(detail_level, prompts["detailed"])
         max_tokens = {"brief": 50, "detailed": 200, "comprehensive": 400}.get(detail_level, 200)
+        detail = "low" if detail_level == "brief" else "auto"
         
-        return self.analyze_image(base64_image, prompt, max_tokens)
+        return self.analyze_image(base64_image, prompt, max_tokens, detail)
     
     def ask_about_image(self, base64_image: str, question: str) -> Dict[str, Any]:
         """
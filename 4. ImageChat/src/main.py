@@ -3,37 +3,46 @@ Main application for the Image Analysis Program using GPT-4 Vision API.
 """
 
 import argparse
+import asyncio
+import itertools
 import sys
 import os
-from typing import List, Dict, Any, Optional
+from typing import Iterable, List, Dict, Any, Optional
 from pathlib import Path
 
-from image_processor import ImageProcessor, get_image_info
-from api_client import VisionAPIClient
 from utils import (
     format_response, validate_image_path, validate_image_url, 
     get_config_from_env, save_analysis_result, print_colored,
-    progress_bar, extract_image_paths_from_directory, create_summary_report
+    progress_bar, iter_image_paths_from_directory, create_summary_report
 )
 
 
 class ImageAnalyzer:
     """Main application class for image analysis."""
     
-    def __init__(self, config: Optional[Dict[str, Any]] = None):
+    def __init__(self, config: Optional[Dict[str, Any]] = None, validate_on_init: bool = True):
         """
         Initialize the Image Analyzer.
         
         Args:
             config: Configuration dictionary (if None, loads from environment)
+            validate_on_init: Check the API key with a request up front. Batch runs
+                can skip this round-trip; their first real call reports a bad key.
         """
         self.config = config or get_config_from_env()
         
         if not self.config.get('api_key'):
             raise ValueError("OpenAI API key is required. Please set OPENAI_API_KEY environment variable.")
         
+        # Imported here so `--info` doesn't pay for loading the OpenAI SDK
+        from image_processor import ImageProcessor
+        from api_client import VisionAPIClient
+        
         # Initialize components
-        self.image_processor = ImageProcessor(max_size_mb=self.config['max_image_size_mb'])
+        self.image_processor = ImageProcessor(
+            max_size_mb=self.config['max_image_size_mb'],
+            resample_quality=self.config.get('resample_quality', 'fast')
+        )
         self.api_client = VisionAPIClient(
             api_key=self.config['api_key'],
             model=self.config['model'],
@@ -42,7 +51,7 @@ class ImageAnalyzer:
         )
         
         # Validate API key
-        if not self.api_client.validate_api_key():
+        if validate_on_init and not self.api_client.validate_api_key():
             raise ValueError("Invalid OpenAI API key. Please check your API key.")
     
     def analyze_single_image(self, image_source: str, prompt: str = None, 
@@ -62,49 +71,63 @@ class ImageAnalyzer:
         try:
             print_colored(f"📸 Processing image: {image_source}", "cyan")
             
-            # Process image
-            base64_image, image_info = self.image_processor.process_image(image_source)
-            
-            print_colored(f"✅ Image processed: {image_info['processed_size']} pixels, "
-                         f"{image_info['base64_size_kb']:.1f} KB", "green")
-            
-            # Analyze image
-            if prompt:
-                result = self.api_client.ask_about_image(base64_image, prompt)
-            else:
-                result = self.api_client.get_image_description(base64_image, detail_level)
-            
-            # Add image info to result
-            result['image_info'] = image_info
-            result['source'] = image_source
+            # Brief descriptions use the API's low detail tier, which only sees 512px
+            max_dimension = 512 if detail_level == "brief" and not prompt else 1024
             
-            if save_result:
-                output_file = save_analysis_result(result)
-                print_colored(f"💾 Result saved to: {output_file}", "yellow")
+            # Process image
+            base64_image, image_info = self.image_processor.process_image(image_source, 
+                                                                          max_dimension=max_dimension)
             
-            return result
+            return self._analyze_processed_image(image_source, base64_image, image_info, 
+                                                 prompt, detail_level, save_result)
             
         except Exception as e:
-            error_result = {
-                'success': False,
-                'error': 'Processing failed',
-                'message': str(e),
-                'source': image_source
-            }
-            
-            if save_result:
-                output_file = save_analysis_result(error_result)
-                print_colored(f"💾 Error result saved to: {output_file}", "yellow")
-            
-            return error_result
+            return self._failed_result(image_source, e, save_result)
+    
+    def _analyze_processed_image(self, image_source: str, base64_image: str, image_info: Dict[str, Any],
+                                 prompt: str, detail_level: str, save_result: bool) -> Dict[str, Any]:
+        """Send an already processed image to the API and attach its info to the result."""
+        print_colored(f"✅ Image processed: {image_info['processed_size']} pixels, "
+                     f"{image_info['base64_size_kb']:.1f} KB", "green")
+        
+        # Analyze image
+        if prompt:
+            result = self.api_client.ask_about_image(base64_image, prompt)
+        else:
+            result = self.api_client.get_image_description(base64_image, detail_level)
+        
+        # Add image info to result
+        result['image_info'] = image_info
+        result['source'] = image_source
+        
+        if save_result:
+            output_file = save_analysis_result(result)
+            print_colored(f"💾 Result saved to: {output_file}", "yellow")
+        
+        return result
+    
+    def _failed_result(self, image_source: str, error: Exception, save_result: bool) -> Dict[str, Any]:
+        """Build (and optionally save) the result for an image that could not be analyzed."""
+        error_result = {
+            'success': False,
+            'error': 'Processing failed',
+            'message': str(error),
+            'source': image_source
+        }
+        
+        if save_result:
+            output_file = save_analysis_result(error_result)
+            print_colored(f"💾 Error result saved to: {output_file}", "yellow")
+        
+        return error_result
     
-    def analyze_multiple_images(self, image_sources: List[str], prompt: str = None,
+    def analyze_multiple_images(self, image_sources: Iterable[str], prompt: str = None,
                                batch_size: int = 1, save_results: bool = False) -> List[Dict[str, Any]]:
         """
         Analyze multiple images.
         
         Args:
-            image_sources: List of image paths or URLs
+            image_sources: Image paths or URLs (a list, or any iterable such as a generator)
             prompt: Custom prompt for analysis
             batch_size: Number of images to process in each batch (currently supports 1)
             save_results: Whether to save results to files
@@ -112,29 +135,75 @@ class ImageAnalyzer:
         Returns:
             List of analysis results
         """
-        results = []
-        total_images = len(image_sources)
+        return asyncio.run(self.analyze_multiple_images_async(image_sources, prompt, save_results=save_results))
+    
+    async def analyze_multiple_images_async(self, image_sources: Iterable[str], prompt: str = None,
+                                            save_results: bool = False, 
+                                            concurrency: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Analyze multiple images concurrently.
         
-        print_colored(f"🔄 Starting analysis of {total_images} images", "cyan")
+        Image processing runs in the image processor's worker processes and each
+        API call in a worker thread, so CPU work uses all cores and API round-trips
+        overlap; an image's request starts as soon as that image is processed.
         
-        for i, image_source in enumerate(image_sources, 1):
-            print(f"\n{progress_bar(i-1, total_images)} Processing image {i}/{total_images}")
-            
-            result = self.analyze_single_image(
-                image_source, 
-                prompt, 
-                save_result=save_results
-            )
-            
-            results.append(result)
+        A fixed set of workers pulls sources from image_sources as they go, so a
+        generator is never materialized and only `concurrency` images are in flight.
+        
+        Args:
+            image_sources: Image paths or URLs (a list, or any iterable such as a generator)
+            prompt: Custom prompt for analysis
+            save_results: Whether to save results to files
+            concurrency: Maximum images in flight (default: config 'concurrency', 8)
             
-            # Show progress
-            if result.get('success'):
-                print_colored("✅ Analysis completed", "green")
-            else:
-                print_colored("❌ Analysis failed", "red")
+        Returns:
+            List of analysis results, in the same order as image_sources
+        """
+        # Generators have no length; progress is then shown as a plain count
+        total_images = len(image_sources) if hasattr(image_sources, '__len__') else None
+        sources = enumerate(image_sources)
+        results = []
+        completed = 0
         
-        print(f"\n{progress_bar(total_images, total_images)} Complete!")
+        if total_images is None:
+            print_colored("🔄 Starting analysis of images", "cyan")
+        else:
+            print_colored(f"🔄 Starting analysis of {total_images} images", "cyan")
+        
+        async def analyze_one(image_source):
+            try:
+                print_colored(f"📸 Processing image: {image_source}", "cyan")
+                base64_image, image_info = await self.image_processor.process_image_async(image_source)
+                return await asyncio.to_thread(
+                    self._analyze_processed_image, image_source, base64_image, image_info,
+                    prompt, "detailed", save_results
+                )
+            except Exception as e:
+                return self._failed_result(image_source, e, save_results)
+        
+        async def worker():
+            nonlocal completed
+            for index, image_source in sources:
+                results.append(None)
+                result = await analyze_one(image_source)
+                results[index] = result
+                
+                completed += 1
+                if total_images is None:
+                    print(f"\n[{completed}] {image_source}")
+                else:
+                    print(f"\n{progress_bar(completed, total_images)} {image_source}")
+                
+                # Show progress
+                if result.get('success'):
+                    print_colored("✅ Analysis completed", "green")
+                else:
+                    print_colored("❌ Analysis failed", "red")
+        
+        workers = concurrency or self.config.get('concurrency', 8)
+        await asyncio.gather(*(worker() for _ in range(workers)))
+        
+        print(f"\n{progress_bar(completed, completed)} Complete!")
         
         # Generate summary
         summary = create_summary_report(results)
@@ -159,16 +228,18 @@ class ImageAnalyzer:
         if not os.path.isdir(directory_path):
             raise ValueError(f"Directory not found: {directory_path}")
         
-        # Extract image paths
-        image_paths = extract_image_paths_from_directory(directory_path, recursive)
+        # Stream image paths straight from the directory walk
+        image_paths = iter_image_paths_from_directory(directory_path, recursive)
+        first_path = next(image_paths, None)
         
-        if not image_paths:
+        if first_path is None:
             print_colored("No images found in the directory.", "yellow")
             return []
         
-        print_colored(f"📁 Found {len(image_paths)} images in directory", "cyan")
+        print_colored(f"📁 Analyzing images in {directory_path}", "cyan")
         
-        return self.analyze_multiple_images(image_paths, prompt, save_results=save_results)
+        return self.analyze_multiple_images(itertools.chain([first_path], image_paths), prompt, 
+                                            save_results=save_results)
     
     def interactive_mode(self):
         """Run the application in interactive mode."""
@@ -303,9 +374,7 @@ class ImageAnalyzer:
     
     def _show_image_info(self, image_path: str):
         """Show image file information."""
-        if not os.path.exists(image_path):
-            print_colored(f"❌ File not found: {image_path}", "red")
-            return
+        from image_processor import get_image_info
         
         info = get_image_info(image_path)
         if 'error' in info:
@@ -351,6 +420,8 @@ def main():
     try:
         # Show image info only (no API call needed)
         if args.info and args.image:
+            from image_processor import get_image_info
+            
             info = get_image_info(args.image)
             if 'error' in info:
                 print_colored(f"❌ Error: {info['error']}", "red")
@@ -361,8 +432,8 @@ def main():
                 print(f"  {key}: {value}")
             return 0
         
-        # Initialize analyzer (requires API key)
-        analyzer = ImageAnalyzer()
+        # Initialize analyzer (requires API key); batch runs skip the extra key check
+        analyzer = ImageAnalyzer(validate_on_init=not (args.directory or args.multiple))
         
         # Interactive mode
         if args.interactive:
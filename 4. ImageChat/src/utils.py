@@ -3,11 +3,37 @@ Utility functions for the image analysis program.
 """
 
 import os
+import re
+import sys
 import json
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterator, List, Optional
 from datetime import datetime
-import re
-from dotenv import load_dotenv
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Supported image file extensions; the tuple form feeds str.endswith
+IMAGE_EXTENSIONS = frozenset({'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp'})
+_IMAGE_EXTENSION_TUPLE = tuple(IMAGE_EXTENSIONS)
+# Any image extension anywhere in a URL (e.g. before a query string)
+_URL_EXTENSION_RE = re.compile('|'.join(re.escape(ext) for ext in IMAGE_EXTENSIONS), re.IGNORECASE)
+
+# ANSI color codes for print_colored; colors are skipped when stdout isn't a terminal
+_ANSI_COLORS = {
+    'red': '\033[91m',
+    'green': '\033[92m',
+    'yellow': '\033[93m',
+    'blue': '\033[94m',
+    'cyan': '\033[96m',
+    'magenta': '\033[95m',
+    'white': '\033[97m'
+}
+# Reset and newline folded into one suffix for print_colored
+_ANSI_LINE_END = '\033[0m\n'
+_USE_COLOR = sys.stdout.isatty()
 
 
 def format_response(response_data: Dict[str, Any], include_metadata: bool = False) -> str:
@@ -57,10 +83,7 @@ def validate_image_path(path: str) -> bool:
     if not os.path.exists(path):
         return False
     
-    valid_extensions = {'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp'}
-    _, ext = os.path.splitext(path.lower())
-    
-    return ext in valid_extensions
+    return path.lower().endswith(_IMAGE_EXTENSION_TUPLE)
 
 
 def validate_image_url(url: str) -> bool:
@@ -76,19 +99,8 @@ def validate_image_url(url: str) -> bool:
     if not url.startswith(('http://', 'https://')):
         return False
     
-    valid_extensions = {'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp'}
-    
-    # Check if URL ends with image extension
-    for ext in valid_extensions:
-        if url.lower().endswith(ext):
-            return True
-    
-    # Check if URL contains image extension with parameters
-    for ext in valid_extensions:
-        if ext in url.lower():
-            return True
-    
-    return False
+    # One scan covers both a trailing extension and one followed by parameters
+    return _URL_EXTENSION_RE.search(url) is not None
 
 
 def get_config_from_env() -> Dict[str, Any]:
@@ -99,6 +111,7 @@ def get_config_from_env() -> Dict[str, Any]:
         Dictionary with configuration values
     """
     # Load environment variables from .env file
+    from dotenv import load_dotenv
     load_dotenv()
     
     return {
@@ -107,7 +120,9 @@ def get_config_from_env() -> Dict[str, Any]:
         'max_image_size_mb': int(os.getenv('MAX_IMAGE_SIZE_MB', '10')),
         'api_timeout': int(os.getenv('API_TIMEOUT_SECONDS', '30')),
         'max_retries': int(os.getenv('MAX_RETRIES', '3')),
-        'rate_limit_delay': int(os.getenv('RATE_LIMIT_DELAY', '1'))
+        'rate_limit_delay': int(os.getenv('RATE_LIMIT_DELAY', '1')),
+        'concurrency': int(os.getenv('MAX_CONCURRENCY', '8')),
+        'resample_quality': os.getenv('RESAMPLE_QUALITY', 'fast')
     }
 
 
@@ -122,15 +137,22 @@ def save_analysis_result(result: Dict[str, Any], output_file: str = None) -> str
     Returns:
         Path to the saved file
     """
+    # One clock read for both the file name and the saved_at field
+    now = datetime.now()
+    
     if output_file is None:
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = now.strftime("%Y%m%d_%H%M%S")
         output_file = f"analysis_result_{timestamp}.json"
     
     # Add timestamp to the result
-    result['saved_at'] = datetime.now().isoformat()
+    result['saved_at'] = now.isoformat()
     
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(result, f, indent=2, ensure_ascii=False)
+    if orjson is not None:
+        with open(output_file, 'wb') as f:
+            f.write(orjson.dumps(result, option=orjson.OPT_INDENT_2))
+    else:
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
     
     return output_file
 
@@ -149,8 +171,8 @@ def load_analysis_result(input_file: str) -> Dict[str, Any]:
         FileNotFoundError: If file doesn't exist
         json.JSONDecodeError: If file is not valid JSON
     """
-    with open(input_file, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    with open(input_file, 'rb') as f:
+        return orjson.loads(f.read()) if orjson is not None else json.load(f)
 
 
 def format_file_size(size_bytes: int) -> str:
@@ -183,13 +205,8 @@ def clean_text(text: str) -> str:
     if not text:
         return ""
     
-    # Remove excessive whitespace
-    text = re.sub(r'\s+', ' ', text)
-    
-    # Remove leading/trailing whitespace
-    text = text.strip()
-    
-    return text
+    # Collapse runs of whitespace and trim the ends; str.split() does both in one C pass
+    return ' '.join(text.split())
 
 
 def create_summary_report(analyses: List[Dict[str, Any]]) -> str:
@@ -205,40 +222,43 @@ def create_summary_report(analyses: List[Dict[str, Any]]) -> str:
     if not analyses:
         return "No analyses to summarize."
     
-    total_tokens = sum(
-        analysis.get('usage', {}).get('total_tokens', 0) 
-        for analysis in analyses 
-        if analysis.get('success', False)
-    )
-    
-    successful_analyses = sum(1 for analysis in analyses if analysis.get('success', False))
-    failed_analyses = len(analyses) - successful_analyses
-    
-    report = f"📋 **Analysis Summary Report**\n"
-    report += f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
-    report += f"📊 **Statistics:**\n"
-    report += f"- Total analyses: {len(analyses)}\n"
-    report += f"- Successful: {successful_analyses}\n"
-    report += f"- Failed: {failed_analyses}\n"
-    report += f"- Total tokens used: {total_tokens:,}\n\n"
-    
-    if successful_analyses > 0:
-        report += f"✅ **Successful Analyses:**\n"
-        for i, analysis in enumerate(analyses, 1):
-            if analysis.get('success', False):
-                content_preview = analysis.get('content', '')[:100]
-                if len(content_preview) > 100:
-                    content_preview += "..."
-                report += f"{i}. {content_preview}\n"
-    
-    if failed_analyses > 0:
-        report += f"\n❌ **Failed Analyses:**\n"
-        for i, analysis in enumerate(analyses, 1):
-            if not analysis.get('success', False):
-                error_msg = analysis.get('message', 'Unknown error')
-                report += f"{i}. Error: {error_msg}\n"
-    
-    return report
+    # One pass collects the counts and the per-analysis lines
+    total_tokens = 0
+    successful_lines = []
+    failed_lines = []
+    for i, analysis in enumerate(analyses, 1):
+        if analysis.get('success', False):
+            total_tokens += analysis.get('usage', {}).get('total_tokens', 0)
+            content_preview = analysis.get('content', '')[:100]
+            if len(content_preview) > 100:
+                content_preview += "..."
+            successful_lines.append(f"{i}. {content_preview}\n")
+        else:
+            error_msg = analysis.get('message', 'Unknown error')
+            failed_lines.append(f"{i}. Error: {error_msg}\n")
+    
+    successful_analyses = len(successful_lines)
+    failed_analyses = len(failed_lines)
+    
+    report = [
+        f"📋 **Analysis Summary Report**\n",
+        f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n",
+        f"📊 **Statistics:**\n",
+        f"- Total analyses: {len(analyses)}\n",
+        f"- Successful: {successful_analyses}\n",
+        f"- Failed: {failed_analyses}\n",
+        f"- Total tokens used: {total_tokens:,}\n\n"
+    ]
+    
+    if successful_lines:
+        report.append(f"✅ **Successful Analyses:**\n")
+        report.extend(successful_lines)
+    
+    if failed_lines:
+        report.append(f"\n❌ **Failed Analyses:**\n")
+        report.extend(failed_lines)
+    
+    return "".join(report)
 
 
 def print_colored(text: str, color: str = 'white') -> None:
@@ -249,19 +269,12 @@ def print_colored(text: str, color: str = 'white') -> None:
         text: Text to print
         color: Color name ('red', 'green', 'yellow', 'blue', 'cyan', 'magenta', 'white')
     """
-    colors = {
-        'red': '\033[91m',
-        'green': '\033[92m',
-        'yellow': '\033[93m',
-        'blue': '\033[94m',
-        'cyan': '\033[96m',
-        'magenta': '\033[95m',
-        'white': '\033[97m',
-        'reset': '\033[0m'
-    }
+    if not _USE_COLOR:
+        sys.stdout.write(f"{text}\n")
+        return
     
-    color_code = colors.get(color.lower(), colors['white'])
-    print(f"{color_code}{text}{colors['reset']}")
+    color_code = _ANSI_COLORS.get(color) or _ANSI_COLORS.get(color.lower(), _ANSI_COLORS['white'])
+    sys.stdout.write(f"{color_code}{text}{_ANSI_LINE_END}")
 
 
 def progress_bar(current: int, total: int, width: int = 50) -> str:
@@ -287,6 +300,35 @@ def progress_bar(current: int, total: int, width: int = 50) -> str:
     return f"[{bar}] {percentage}% ({current}/{total})"
 
 
+def iter_image_paths_from_directory(directory: str, recursive: bool = False) -> Iterator[str]:
+    """
+    Lazily yield image file paths from a directory, in directory order.
+    
+    Args:
+        directory: Directory path to search
+        recursive: Whether to search subdirectories
+        
+    Yields:
+        Image file paths
+    """
+    pending = [directory]
+    
+    # scandir entries carry their file type, so no extra stat per file
+    while pending:
+        try:
+            entries = os.scandir(pending.pop())
+        except OSError:
+            # Skip unreadable directories, like os.walk does by default
+            continue
+        
+        with entries:
+            for entry in entries:
+                if recursive and entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                elif entry.is_file() and entry.name.lower().endswith(_IMAGE_EXTENSION_TUPLE):
+                    yield entry.path
+
+
 def extract_image_paths_from_directory(directory: str, recursive: bool = False) -> List[str]:
     """
     Extract all image file paths from a directory.
@@ -296,23 +338,6 @@ def extract_image_paths_from_directory(directory: str, recursive: bool = False)
         recursive: Whether to search subdirectories
         
     Returns:
-        List of image file paths
+        Sorted list of image file paths
     """
-    image_extensions = {'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp'}
-    image_paths = []
-    
-    if recursive:
-        for root, dirs, files in os.walk(directory):
-            for file in files:
-                _, ext = os.path.splitext(file.lower())
-                if ext in image_extensions:
-                    image_paths.append(os.path.join(root, file))
-    else:
-        for file in os.listdir(directory):
-            file_path = os.path.join(directory, file)
-            if os.path.isfile(file_path):
-                _, ext = os.path.splitext(file.lower())
-                if ext in image_extensions:
-                    image_paths.append(file_path)
-    
-    return sorted(image_paths) 
\ No newline at end of file
+    return sorted(iter_image_paths_from_directory(directory, recursive)) 
\ No newline at end of file
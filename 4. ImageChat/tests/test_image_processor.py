@@ -3,10 +3,16 @@ Unit tests for the image processor module.
 """
 
 import unittest
+import asyncio
+import base64
+import functools
 import tempfile
 import os
-from unittest.mock import patch, Mock
-from PIL import Image
+from io import BytesIO
+from unittest.mock import patch
+from PIL import Image, ImageFile
+import requests
+from urllib3 import HTTPResponse
 import sys
 
 # Add src directory to path for imports
@@ -15,27 +21,61 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 from image_processor import ImageProcessor, get_image_info
 
 
+@functools.lru_cache(maxsize=16)
+def _fake_image_bytes(width: int, height: int, color, fmt: str) -> bytes:
+    """Encode an RGB test image once per (size, color, format) for the whole run."""
+    buffer = BytesIO()
+    options = {'compress_level': 1} if fmt == 'PNG' else {}
+    Image.new('RGB', (width, height), color=color).save(buffer, format=fmt, **options)
+    return buffer.getvalue()
+
+
+def _static_response(request, body: bytes, status: int = 200) -> requests.Response:
+    """Build a real (unsent) requests Response that streams the given body."""
+    response = requests.Response()
+    response.status_code = status
+    response.url = request.url
+    response.request = request
+    response.raw = HTTPResponse(body=BytesIO(body), status=status, preload_content=False)
+    return response
+
+
 class TestImageProcessor(unittest.TestCase):
     """Test cases for ImageProcessor class."""
     
+    @classmethod
+    def setUpClass(cls):
+        """Build shared fixtures once for the whole class (tests only read them)."""
+        cls.jpeg_bytes = _fake_image_bytes(50, 50, 'blue', 'JPEG')
+        
+        cls.green_image = Image.new('RGB', (100, 100), color='green')
+        cls.orange_image = Image.new('RGB', (50, 50), color='orange')
+        # Only sizes are checked on these, so skip the pixel fill (color=None)
+        cls.small_image = Image.new('RGB', (500, 400), color=None)
+        cls.large_image = Image.new('RGB', (2000, 1500), color=None)
+        
+        # One private directory per class, so parallel runners never share files.
+        # temp_image_path is read-only; tests that rewrite a file make their own
+        cls._tmpdir = tempfile.TemporaryDirectory()
+        cls.temp_image_path = os.path.join(cls._tmpdir.name, 'fixture.jpg')
+        Image.new('RGB', (100, 100), color='red').save(cls.temp_image_path, 'JPEG')
+    
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the temporary directory."""
+        cls._tmpdir.cleanup()
+    
     def setUp(self):
         """Set up test fixtures."""
         self.processor = ImageProcessor(max_size_mb=5)
-        
-        # Create a temporary test image
-        self.temp_image = tempfile.NamedTemporaryFile(delete=False, suffix='.jpg')
-        image = Image.new('RGB', (100, 100), color='red')
-        image.save(self.temp_image.name, 'JPEG')
-        self.temp_image.close()
     
-    def tearDown(self):
-        """Clean up test fixtures."""
-        if os.path.exists(self.temp_image.name):
-            os.unlink(self.temp_image.name)
+    def _scratch_path(self, suffix: str = '.jpg') -> str:
+        """Path in the class directory that only the current test uses."""
+        return os.path.join(self._tmpdir.name, self._testMethodName + suffix)
     
     def test_load_image_from_file(self):
         """Test loading image from file path."""
-        image = self.processor.load_image(self.temp_image.name)
+        image = self.processor.load_image(self.temp_image_path)
         self.assertIsInstance(image, Image.Image)
         self.assertEqual(image.size, (100, 100))
     
@@ -44,36 +84,43 @@ class TestImageProcessor(unittest.TestCase):
         with self.assertRaises(ValueError):
             self.processor.load_image('nonexistent.jpg')
     
-    @patch('requests.get')
-    def test_load_image_from_url(self, mock_get):
+    def test_load_image_from_url(self):
         """Test loading image from URL."""
-        # Mock HTTP response
-        mock_response = Mock()
-        mock_response.raise_for_status.return_value = None
-        
-        # Create mock image content
-        temp_image = Image.new('RGB', (50, 50), color='blue')
-        from io import BytesIO
-        buffer = BytesIO()
-        temp_image.save(buffer, format='JPEG')
-        mock_response.content = buffer.getvalue()
+        # Stub only the transport, so requests builds and streams a real Response
+        def send(adapter, request, **kwargs):
+            self.assertTrue(kwargs['stream'])
+            return _static_response(request, self.jpeg_bytes)
         
-        mock_get.return_value = mock_response
+        with patch.object(requests.adapters.HTTPAdapter, 'send', autospec=True, side_effect=send) as mock_send:
+            image = self.processor.load_image('https://example.com/test.jpg')
         
-        image = self.processor.load_image('https://example.com/test.jpg')
+        mock_send.assert_called_once()
+        self.assertEqual(mock_send.call_args[0][1].url, 'https://example.com/test.jpg')
         self.assertIsInstance(image, Image.Image)
         self.assertEqual(image.size, (50, 50))
     
+    def test_load_image_from_url_http_error(self):
+        """Test an HTTP error status is reported as a load failure."""
+        def send(adapter, request, **kwargs):
+            return _static_response(request, b'not found', status=404)
+        
+        with patch.object(requests.adapters.HTTPAdapter, 'send', autospec=True, side_effect=send):
+            with self.assertRaises(ValueError):
+                self.processor.load_image('https://example.com/missing.jpg')
+    
     def test_validate_image_size_success(self):
         """Test successful image size validation."""
-        image = Image.new('RGB', (100, 100), color='green')
-        result = self.processor.validate_image_size(image)
+        result = self.processor.validate_image_size(self.green_image)
         self.assertTrue(result)
     
+    def test_validate_image_size_from_bytes(self):
+        """Test size validation against already encoded bytes."""
+        with self.assertRaises(ValueError):
+            self.processor.validate_image_size(self.green_image, b'\0' * (6 * 1024 * 1024))
+    
     def test_optimize_image_resize(self):
         """Test image optimization with resizing."""
-        # Create large image
-        large_image = Image.new('RGB', (2000, 1500), color='yellow')
+        large_image = self.large_image
         optimized = self.processor.optimize_image(large_image, max_dimension=1024)
         
         # Should be resized
@@ -85,32 +132,62 @@ class TestImageProcessor(unittest.TestCase):
             places=2
         )
     
+    def test_optimize_large_jpeg(self):
+        """Test optimizing a large JPEG decoded in draft mode."""
+        image = self.processor.load_image(_fake_image_bytes(4000, 3000, None, 'JPEG'))
+        with patch.object(image, 'draft', wraps=image.draft) as mock_draft:
+            optimized = self.processor.optimize_image(image, max_dimension=1024)
+        
+        mock_draft.assert_called_once_with('RGB', (1024, 768))
+        self.assertEqual(optimized.size, (1024, 768))
+    
     def test_optimize_image_no_resize_needed(self):
         """Test image optimization when no resize is needed."""
-        small_image = Image.new('RGB', (500, 400), color='purple')
-        optimized = self.processor.optimize_image(small_image, max_dimension=1024)
+        optimized = self.processor.optimize_image(self.small_image, max_dimension=1024)
         
-        # Should not be resized
+        # Should not be resized, or even copied
         self.assertEqual(optimized.size, (500, 400))
+        self.assertIs(optimized, self.small_image)
+    
+    def test_optimize_image_converts_mode(self):
+        """Test only images with alpha are composited onto white."""
+        opaque = Image.new('RGB', (10, 10), color='red').convert('P')
+        self.assertEqual(self.processor.optimize_image(opaque).getpixel((0, 0)), (255, 0, 0))
+        
+        transparent = Image.new('P', (10, 10), color=0)
+        transparent.info['transparency'] = 0
+        self.assertEqual(self.processor.optimize_image(transparent).getpixel((0, 0)), (255, 255, 255))
+        
+        gray_alpha = Image.new('LA', (10, 10), color=(0, 0))
+        optimized = self.processor.optimize_image(gray_alpha)
+        self.assertEqual(optimized.mode, 'RGB')
+        self.assertEqual(optimized.getpixel((0, 0)), (255, 255, 255))
     
     def test_encode_image_to_base64(self):
         """Test base64 encoding of image."""
-        image = Image.new('RGB', (50, 50), color='orange')
+        image = self.orange_image
         base64_str = self.processor.encode_image_to_base64(image)
         
         self.assertIsInstance(base64_str, str)
         self.assertTrue(len(base64_str) > 0)
         
-        # Should be valid base64
-        import base64
-        try:
-            base64.b64decode(base64_str)
-        except Exception:
-            self.fail("Generated string is not valid base64")
+        # Should be valid base64 of the encoded image (no decode round-trip needed)
+        self.assertEqual(len(base64_str) % 4, 0)
+        self.assertEqual(base64_str, base64.b64encode(self.processor.encode_image(image)).decode('ascii'))
+    
+    def test_encode_image_progressive(self):
+        """Test JPEGs are progressive by default and baseline when disabled."""
+        image = self.orange_image
+        
+        encoded = Image.open(BytesIO(self.processor.encode_image(image)))
+        self.assertTrue(encoded.info.get('progressive'))
+        
+        baseline = ImageProcessor(progressive_jpeg=False).encode_image(image)
+        self.assertFalse(Image.open(BytesIO(baseline)).info.get('progressive'))
     
     def test_process_image_complete_pipeline(self):
         """Test complete image processing pipeline."""
-        base64_image, image_info = self.processor.process_image(self.temp_image.name)
+        base64_image, image_info = self.processor.process_image(self.temp_image_path)
         
         # Check base64 output
         self.assertIsInstance(base64_image, str)
@@ -125,27 +202,79 @@ class TestImageProcessor(unittest.TestCase):
         self.assertIn('base64_size_kb', image_info)
         
         self.assertEqual(image_info['original_size'], (100, 100))
+    
+    def test_process_image_cached(self):
+        """Test repeat processing of an unchanged file is served from the cache."""
+        path = self._scratch_path()
+        Image.new('RGB', (100, 100), color='red').save(path, 'JPEG')
+        first = self.processor.process_image(path)
+        
+        with patch.object(self.processor, 'load_image') as mock_load:
+            second = self.processor.process_image(path)
+            mock_load.assert_not_called()
+        
+        self.assertEqual(first, second)
+        
+        # Rewriting the file changes its size/mtime, so it is processed again
+        Image.new('RGB', (60, 40), color='blue').save(path, 'JPEG')
+        _, image_info = self.processor.process_image(path)
+        self.assertEqual(image_info['original_size'], (60, 40))
+    
+    def test_process_image_max_dimension(self):
+        """Test a smaller max_dimension is applied and cached separately."""
+        path = self._scratch_path()
+        Image.new('RGB', (2000, 1000), color=None).save(path, 'JPEG')
+        
+        _, full_info = self.processor.process_image(path)
+        _, low_info = self.processor.process_image(path, max_dimension=512)
+        
+        self.assertEqual(full_info['processed_size'], (1024, 512))
+        self.assertEqual(low_info['processed_size'], (512, 256))
+    
+    def test_prepare_batch(self):
+        """Test parallel batch processing keeps input order."""
+        sources = [self.temp_image_path, _fake_image_bytes(1500, 1000, None, 'PNG')]
+        results = asyncio.run(self.processor.prepare_batch(sources))
+        
+        self.assertEqual(len(results), 2)
+        self.assertEqual(results[0], self.processor.process_image(self.temp_image_path)[0])
+        decoded = Image.open(BytesIO(base64.b64decode(results[1])))
+        self.assertEqual(decoded.size, (1024, 682))
+
+    
+    def test_prepare_batch_gpu_fallback(self):
+        """Test the CPU fallback honors max_dimension and quality."""
+        path = self._scratch_path()
+        with open(path, 'wb') as f:
+            f.write(_fake_image_bytes(2000, 1000, 'red', 'JPEG'))
+        
+        low, high = (self.processor.prepare_batch_gpu([path], max_dimension=512, quality=q)[0]
+                     for q in (20, 95))
+        
+        decoded = Image.open(BytesIO(base64.b64decode(low)))
+        self.assertEqual(decoded.size, (512, 256))
+        self.assertLess(len(low), len(high))
 
 
 class TestGetImageInfo(unittest.TestCase):
     """Test cases for get_image_info function."""
     
-    def setUp(self):
-        """Set up test fixtures."""
-        # Create a temporary test image
-        self.temp_image = tempfile.NamedTemporaryFile(delete=False, suffix='.png')
+    @classmethod
+    def setUpClass(cls):
+        """Create the (read-only) test image once in a private directory."""
+        cls._tmpdir = tempfile.TemporaryDirectory()
+        cls.temp_image_path = os.path.join(cls._tmpdir.name, 'fixture.png')
         image = Image.new('RGBA', (200, 150), color='cyan')
-        image.save(self.temp_image.name, 'PNG')
-        self.temp_image.close()
+        image.save(cls.temp_image_path, 'PNG', compress_level=1)
     
-    def tearDown(self):
-        """Clean up test fixtures."""
-        if os.path.exists(self.temp_image.name):
-            os.unlink(self.temp_image.name)
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the temporary directory."""
+        cls._tmpdir.cleanup()
     
     def test_get_image_info_success(self):
         """Test successful image info extraction."""
-        info = get_image_info(self.temp_image.name)
+        info = get_image_info(self.temp_image_path)
         
         self.assertIsInstance(info, dict)
         self.assertNotIn('error', info)
@@ -163,6 +292,14 @@ class TestGetImageInfo(unittest.TestCase):
         self.assertEqual(info['height'], 150)
         self.assertGreater(info['file_size_bytes'], 0)
     
+    def test_get_image_info_reads_header_only(self):
+        """Test image info never decodes pixel data."""
+        with patch.object(ImageFile.ImageFile, 'load') as mock_load:
+            info = get_image_info(self.temp_image_path)
+        
+        mock_load.assert_not_called()
+        self.assertEqual(info['size'], (200, 150))
+    
     def test_get_image_info_file_not_found(self):
         """Test image info for non-existent file."""
         info = get_image_info('nonexistent.jpg')
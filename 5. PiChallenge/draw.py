@@ -1,33 +1,45 @@
 import pyautogui
 import math
+import sys
 import time
 
-# Give yourself 5 seconds to move to Paint window
-wait = True
-total_wait = 5
-while wait:
-    print(f"Waiting for {total_wait} seconds")
+# Give yourself 5 seconds to move to Paint window (countdown updates in place)
+for remaining in range(5, 0, -1):
+    sys.stdout.write(f"\rWaiting for {remaining} seconds ")
+    sys.stdout.flush()
     time.sleep(1)
-    total_wait -= 1
-    if total_wait == 0:
-        wait = False
+print()
 
 
 # Circle parameters
 center_x, center_y = pyautogui.position()  # Use current mouse position as center
 radius = 100
 steps = 120  # Number of points for smoother circle
+step_delay = 0.01  # Seconds between points
+
+# Unit-circle table, computed once so the drawing loop does no trig
+angles = [2 * math.pi * i / steps for i in range(steps + 1)]
+cos_table = [math.cos(angle) for angle in angles]
+sin_table = [math.sin(angle) for angle in angles]
+
+# Whole path, built before the button goes down so the drag loop only moves.
+# Rounded to whole pixels here, instead of pyautogui truncating each float
+points = [(center_x + round(radius * cos_a), center_y + round(radius * sin_a))
+          for cos_a, sin_a in zip(cos_table, sin_table)]
 
 # Move to starting point of the circle BEFORE pressing mouse down
-start_x = center_x + radius
-start_y = center_y
+start_x, start_y = points[0]
 pyautogui.moveTo(start_x, start_y)
 
-# Now start drawing the circle
+# Now start drawing the circle. _pause=False skips pyautogui's 0.1 s PAUSE after
+# every call (12 s for 121 points); a duration under 0.1 s moves instantly anyway
 pyautogui.mouseDown()
-for i in range(steps + 1):
-    angle = 2 * math.pi * i / steps
-    x = center_x + radius * math.cos(angle)
-    y = center_y + radius * math.sin(angle)
-    pyautogui.moveTo(x, y, duration=0.01)  # Small delay for smooth movement
+# Pace points against a fixed schedule, so time spent in moveTo doesn't add up
+next_time = time.perf_counter()
+for x, y in points:
+    pyautogui.moveTo(x, y, duration=0, _pause=False)
+    next_time += step_delay
+    delay = next_time - time.perf_counter()
+    if delay > 0:
+        time.sleep(delay)
 pyautogui.mouseUp()